@@ -0,0 +1,73 @@
+"""Reusable Chrome WebDriver pool for router controller"""
+
+import atexit
+import queue
+import threading
+from typing import Callable, Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+POOL_SIZE = 2
+MAX_USES_PER_INSTANCE = 50
+
+
+class BrowserPool:
+    """Lazily created pool of Chrome drivers recycled between uses"""
+
+    def __init__(self, factory: Callable[[], 'webdriver.Chrome'], size: int = POOL_SIZE,
+                 max_uses: int = MAX_USES_PER_INSTANCE,
+                 close: Optional[Callable[['webdriver.Chrome'], None]] = None):
+        self._factory = factory
+        self._close = close or (lambda driver: driver.quit())
+        self._pool: 'queue.Queue[webdriver.Chrome]' = queue.Queue(maxsize=size)
+        self._max_uses = max_uses
+        self._uses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close_all)
+
+    def acquire(self, factory: Optional[Callable[[], 'webdriver.Chrome']] = None) -> 'webdriver.Chrome':
+        """Return an idle driver from the pool, creating one (with factory, if given) if none is available"""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            driver = (factory or self._factory)()
+            with self._lock:
+                self._uses[id(driver)] = 0
+            return driver
+
+    def release(self, driver: 'webdriver.Chrome', ok: bool = True):
+        """Return a driver to the pool, or quit it if it failed or is worn out"""
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+
+        if ok and uses < self._max_uses:
+            try:
+                # Keep cookies so the next user can reuse the router session
+                driver.get("about:blank")
+                self._pool.put_nowait(driver)
+                return
+            except Exception:
+                # Pool full or driver no longer responsive
+                pass
+
+        self._discard(driver)
+
+    def close_all(self):
+        """Quit every idle driver held by the pool"""
+        while True:
+            try:
+                driver = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def _discard(self, driver: 'webdriver.Chrome'):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            self._close(driver)
+        except Exception:
+            pass
@@ -1,5 +1,8 @@
 """Secure credential management using macOS keychain"""
 
+import getpass
+import json
+import time
 from typing import Tuple, Optional, TYPE_CHECKING
 import keyring
 
@@ -13,17 +16,31 @@ class CredentialManager:
     def __init__(self, logger: 'Logger', service_name: str):
         self.logger = logger
         self.service_name = service_name
+        self._cache: Optional[Tuple[str, str]] = None
+        self._last_prompt: Optional[Tuple[str, str]] = None
+        self._last_prompt_ts = 0.0
     
     def get_credentials(self) -> Tuple[Optional[str], Optional[str]]:
         """Retrieve stored credentials"""
+        if self._cache:
+            return self._cache
+        
         try:
-            username = keyring.get_password(self.service_name, "username")
-            password = keyring.get_password(self.service_name, "password")
+            # Single keychain lookup for the combined entry
+            blob = keyring.get_password(self.service_name, "credentials")
+            if blob:
+                data = json.loads(blob)
+                username, password = data.get("u"), data.get("p")
+            else:
+                # Entries stored by earlier versions live under separate keys
+                username = keyring.get_password(self.service_name, "username")
+                password = keyring.get_password(self.service_name, "password")
             
             if not username or not password:
                 self.logger.info("No stored credentials found")
                 return None, None
             
+            self._cache = (username, password)
             return username, password
         except Exception as e:
             self.logger.error(f"Failed to retrieve credentials: {e}")
@@ -31,9 +48,9 @@ class CredentialManager:
     
     def store_credentials(self, username: str, password: str) -> bool:
         """Store credentials securely"""
+        self._cache = None
         try:
-            keyring.set_password(self.service_name, "username", username)
-            keyring.set_password(self.service_name, "password", password)
+            keyring.set_password(self.service_name, "credentials", json.dumps({"u": username, "p": password}))
             self.logger.info("Credentials stored successfully")
             return True
         except Exception as e:
@@ -42,13 +59,19 @@ class CredentialManager:
     
     def prompt_for_credentials(self) -> Tuple[str, str]:
         """Prompt user for credentials"""
+        # Guard against asking twice in a row for the same answer
+        if self._last_prompt and time.monotonic() - self._last_prompt_ts < 1.0:
+            return self._last_prompt
+        
         print("\nRouter admin credentials not found.")
         print("These will be stored securely in macOS keychain (viewable in Passwords app).")
         username = input("Enter admin username: ").strip()
-        password = input("Enter admin password: ").strip()
+        password = getpass.getpass("Enter admin password: ").strip()
         
-        if input("Store credentials securely in keychain? (y/N): ").lower().startswith('y'):
+        if input("Store credentials securely in keychain? (y/N): ").strip().lower().startswith('y'):
             self.store_credentials(username, password)
             print("Credentials stored. You can manage them in the Passwords app if needed.")
         
-        return username, password
\ No newline at end of file
+        self._last_prompt = (username, password)
+        self._last_prompt_ts = time.monotonic()
+        return username, password
@@ -0,0 +1,163 @@
+"""Plain HTTP radio status reads for router controller"""
+
+import json
+import os
+import time
+import warnings
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import List, Optional, Tuple, TYPE_CHECKING
+from urllib.parse import urljoin, urlparse
+
+try:
+    import requests
+    import urllib3
+except ImportError:
+    requests = None
+
+from models import RadioStatus
+
+if TYPE_CHECKING:
+    from .logger import Logger
+
+
+COOKIE_FILE = Path.home() / ".router_controller_cookies.json"
+
+# Admin URLs whose pages carried no status indicator (form-login firmware), skipped for a week
+UNSUPPORTED_FILE = Path.home() / ".router_controller_http_unsupported.json"
+UNSUPPORTED_TTL = 7 * 24 * 3600
+
+# One session per process so the router connection and cookies are reused
+SESSION = requests.Session() if requests else None
+
+
+class _StatusPageParser(HTMLParser):
+    """Extract the 2.4GHz status indicator class and frame sources from a page"""
+
+    def __init__(self):
+        super().__init__()
+        self.status_class: Optional[str] = None
+        self.frame_srcs: List[str] = []
+        self._in_bgn_section = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        element_id = attrs.get('id') or ''
+        element_class = attrs.get('class') or ''
+
+        if tag in ('iframe', 'frame') and attrs.get('src'):
+            self.frame_srcs.append(attrs['src'])
+
+        # Each advanced-settings tile is a title_* block; only the 2.4GHz one matters
+        if element_id.startswith('title_'):
+            self._in_bgn_section = element_id == 'title_bgn'
+        elif self._in_bgn_section and self.status_class is None and element_class.startswith('img_status'):
+            self.status_class = element_class
+
+
+class HttpStatusClient:
+    """Read radio status over HTTP without launching Chrome"""
+
+    def __init__(self, logger: 'Logger', timeout: int):
+        self.logger = logger
+        self.timeout = timeout
+        self._rejected = False
+        self._load_cookies()
+
+    @staticmethod
+    def is_available() -> bool:
+        """Whether the optional requests dependency is installed"""
+        return SESSION is not None
+
+    def get_radio_status(self, url: str, credentials: Tuple[str, str]) -> Optional[RadioStatus]:
+        """Return the radio status, or None if the page could not be read without a browser"""
+        if SESSION is None:
+            return None
+        if self._is_unsupported(url):
+            self.logger.debug("HTTP status read skipped; this router's pages need a browser")
+            return None
+
+        self._rejected = False
+        try:
+            status_class = self._find_status_class(url, credentials, follow_frames=True)
+        except requests.RequestException as e:
+            self.logger.debug(f"HTTP status read failed: {e}")
+            return None
+
+        if status_class is None:
+            self.logger.debug("Status indicator not present in static HTML")
+            # A rejected login may be transient; pages served without the indicator never will have it
+            if not self._rejected:
+                self._mark_unsupported(url)
+            return None
+
+        self._save_cookies()
+        self.logger.debug(f"Found status element over HTTP with class: {status_class}")
+        if "img_status_good" in status_class:
+            return RadioStatus.RADIO_ON
+        if "img_status_error" in status_class or "img_status_warning" in status_class:
+            return RadioStatus.RADIO_OFF
+        return None
+
+    def _find_status_class(self, url: str, credentials: Tuple[str, str], follow_frames: bool) -> Optional[str]:
+        # The router's certificate is self-signed; silence the warning for this request only
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', urllib3.exceptions.InsecureRequestWarning)
+            response = SESSION.get(url, auth=credentials, timeout=self.timeout, verify=False)
+        if response.status_code in (401, 403):
+            self.logger.debug(f"HTTP status read rejected with {response.status_code}")
+            self._rejected = True
+            return None
+        response.raise_for_status()
+
+        parser = _StatusPageParser()
+        parser.feed(response.text)
+        if parser.status_class or not follow_frames:
+            return parser.status_class
+
+        # The advanced-settings tiles are usually served from a child frame. Credentials
+        # go with every request, so only follow frames served by the router itself
+        origin = urlparse(url)
+        for src in parser.frame_srcs:
+            frame_url = urljoin(url, src)
+            parsed = urlparse(frame_url)
+            if parsed.scheme not in ('http', 'https') or parsed.netloc != origin.netloc:
+                self.logger.debug(f"Skipping frame outside the router admin page: {src}")
+                continue
+            status_class = self._find_status_class(frame_url, credentials, follow_frames=False)
+            if status_class:
+                return status_class
+        return None
+
+    def _is_unsupported(self, url: str) -> bool:
+        try:
+            with open(UNSUPPORTED_FILE, 'r') as f:
+                marked_at = json.load(f).get(url)
+        except (OSError, ValueError, AttributeError):
+            return False
+        return isinstance(marked_at, (int, float)) and time.time() - marked_at < UNSUPPORTED_TTL
+
+    def _mark_unsupported(self, url: str):
+        try:
+            with open(UNSUPPORTED_FILE, 'w') as f:
+                json.dump({url: time.time()}, f)
+        except OSError as e:
+            self.logger.debug(f"Could not record HTTP status support: {e}")
+
+    def _load_cookies(self):
+        if SESSION is None:
+            return
+        try:
+            with open(COOKIE_FILE, 'r') as f:
+                SESSION.cookies.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    def _save_cookies(self):
+        try:
+            # Session cookies grant admin access, so keep the file private to the user
+            fd = os.open(COOKIE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(requests.utils.dict_from_cookiejar(SESSION.cookies), f)
+        except OSError as e:
+            self.logger.debug(f"Could not save router cookies: {e}")
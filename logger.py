@@ -1,12 +1,20 @@
 """Logging system for router controller"""
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import time
-import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 
+CLEAR_LINE = "\r\033[K"
+DEBUG_FLUSH_INTERVAL = 0.05  # seconds between stdout flushes for bursts of debug lines
+SPINNER = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+
+
 class Logger:
     """Dynamic single-line logging system with counter"""
     
@@ -14,6 +22,7 @@ class Logger:
         self.logger = logging.getLogger(name)
         self.dynamic = dynamic
         self.counter = 0
+        self._last_flush = 0.0
         self._setup_logger()
     
     def _setup_logger(self):
@@ -31,7 +40,16 @@ class Logger:
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
             file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+            
+            # Write to disk off the caller thread, batching records into 100-record chunks
+            buffered_handler = logging.handlers.MemoryHandler(capacity=100, target=file_handler)
+            log_queue = queue.Queue(-1)
+            self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            listener = logging.handlers.QueueListener(log_queue, buffered_handler)
+            listener.start()
+            # atexit runs in reverse order: drain the queue, then flush the buffer
+            atexit.register(buffered_handler.close)
+            atexit.register(listener.stop)
             
             # Only add console handler if not in dynamic mode
             if not self.dynamic:
@@ -48,29 +66,33 @@ class Logger:
         self.counter += 1
         
         # Clear line and show new message with counter
-        sys.stdout.write(f"\r\033[K[{self.counter}] {message}")
-        sys.stdout.flush()
+        sys.stdout.write(''.join((CLEAR_LINE, '[', str(self.counter), '] ', message)))
+        
+        # Debug bursts only need to reach the terminal periodically
+        now = time.monotonic()
+        if level != "DEBUG" or now - self._last_flush > DEBUG_FLUSH_INTERVAL:
+            sys.stdout.flush()
+            self._last_flush = now
     
-    def _start_continuous_counter(self, message: str):
-        """Start a continuous counter for long operations"""
+    @contextmanager
+    def progress_spinner(self, message: str):
+        """Yield a tick() callable that redraws a spinner line with elapsed time"""
         if not self.dynamic:
-            return None
-            
-        self.counter += 1
-        start_time = time.time()
+            yield lambda: None
+            return
         
-        def update_counter():
-            while not self._stop_counter.is_set():
-                elapsed = int(time.time() - start_time)
-                sys.stdout.write(f"\r\033[K[{self.counter}] {message} ({elapsed}s)")
-                sys.stdout.flush()
-                time.sleep(1)
+        self.counter += 1
+        start_time = time.monotonic()
+        frame = 0
         
-        self._stop_counter = threading.Event()
-        counter_thread = threading.Thread(target=update_counter, daemon=True)
-        counter_thread.start()
+        def tick():
+            nonlocal frame
+            elapsed = int(time.monotonic() - start_time)
+            sys.stdout.write(f"{CLEAR_LINE}[{self.counter}] {SPINNER[frame % len(SPINNER)]} {message} ({elapsed}s)")
+            sys.stdout.flush()
+            frame += 1
         
-        return self._stop_counter
+        yield tick
     
     def info(self, message: str):
         self.logger.info(message)
@@ -92,6 +114,6 @@ class Logger:
     def clear_line(self):
         """Clear the current dynamic log line"""
         if self.dynamic:
-            sys.stdout.write(f"\r\033[K")
+            sys.stdout.write(CLEAR_LINE)
             sys.stdout.flush()
     
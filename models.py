@@ -1,29 +1,45 @@
 """Data models and enums for router radio controller"""
 
-from enum import Enum
-from dataclasses import dataclass
+import functools
+import sys
+from enum import IntEnum
+from dataclasses import dataclass, fields, replace
 from typing import Optional
 from pathlib import Path
 
+try:
+    import yaml
+except ImportError:
+    yaml = None
 
-class RadioStatus(Enum):
-    RADIO_ON = "RADIO_ON"
-    RADIO_OFF = "RADIO_OFF"
-    NOT_CONNECTED_TO_ROUTER = "NOT_CONNECTED_TO_ROUTER"
-    VPN_CONNECTED = "VPN_CONNECTED"
-    UNEXPECTED_FAILURE = "UNEXPECTED_FAILURE"
+# dataclass(slots=...) needs Python 3.10; macOS's stock python3 is 3.9, where configs just keep a __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 
-class ActionResult(Enum):
-    SUCCESS = "SUCCESS"
-    ALREADY_ON = "ALREADY_ON"
-    ALREADY_OFF = "ALREADY_OFF"
-    NOT_CONNECTED_TO_ROUTER = "NOT_CONNECTED_TO_ROUTER"
-    VPN_CONNECTED = "VPN_CONNECTED"
-    UNEXPECTED_FAILURE = "UNEXPECTED_FAILURE"
+class RadioStatus(IntEnum):
+    RADIO_ON = 0
+    RADIO_OFF = 1
+    NOT_CONNECTED_TO_ROUTER = 2
+    VPN_CONNECTED = 3
+    UNEXPECTED_FAILURE = 4
+    
+    def __str__(self) -> str:
+        return self.name
+
+
+class ActionResult(IntEnum):
+    SUCCESS = 0
+    ALREADY_ON = 1
+    ALREADY_OFF = 2
+    NOT_CONNECTED_TO_ROUTER = 3
+    VPN_CONNECTED = 4
+    UNEXPECTED_FAILURE = 5
+    
+    def __str__(self) -> str:
+        return self.name
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class RouterConfig:
     """Configuration for router connection"""
     target_network: str = "Your_WiFi_Name"
@@ -36,42 +52,51 @@ class RouterConfig:
     retry_delay: int = 2
     enable_notifications: bool = False
     debug_mode: bool = False
+    status_ttl_seconds: int = 5
+    use_http_fallback: bool = True
+    router_ip: Optional[str] = None
+    profile_dir: str = "~/.cache/router_controller/chrome-profile"
+    debugger_address: Optional[str] = None
+    persistent_browser: bool = False
     
     @classmethod
     def from_yaml(cls, config_path: Optional[Path] = None) -> 'RouterConfig':
         """Load configuration from YAML file with validation"""
         if config_path is None:
-            config_path = Path.home() / ".router_controller_config.yaml"
+            config_path = _default_config_path()
+        
+        try:
+            mtime_ns = config_path.stat().st_mtime_ns
+        except OSError:
+            return cls()
         
-        if not config_path.exists():
+        if yaml is None:
+            print("⚠️  PyYAML not installed, using default configuration")
             return cls()
         
+        # Hand out a copy so callers can override fields without touching the cached instance
+        return replace(_load_config(cls, config_path, mtime_ns))
+    
+    @classmethod
+    def _parse_yaml(cls, config_path: Path) -> 'RouterConfig':
+        """Parse and validate a YAML configuration file"""
         try:
-            import yaml
             with open(config_path, 'r') as f:
                 data = yaml.safe_load(f) or {}
             
-            # Validate configuration values
+            # Validate configuration values with one schema lookup per key
             validated_data = {}
             for k, v in data.items():
-                if hasattr(cls, k):
-                    if k == 'timeout' and (not isinstance(v, int) or v < 1):
-                        print(f"⚠️  Invalid timeout value '{v}', using default: 10")
-                        continue
-                    if k == 'retry_attempts' and (not isinstance(v, int) or v < 1):
-                        print(f"⚠️  Invalid retry_attempts value '{v}', using default: 3")
-                        continue
-                    if k in ['headless', 'enable_notifications', 'debug_mode'] and not isinstance(v, bool):
-                        print(f"⚠️  Invalid boolean value for '{k}': {v}, using default")
-                        continue
+                spec = _SCHEMA.get(k)
+                if spec is None:
+                    print(f"⚠️  Unknown configuration key '{k}' ignored")
+                elif isinstance(v, spec[0]) and spec[1](v):
                     validated_data[k] = v
                 else:
-                    print(f"⚠️  Unknown configuration key '{k}' ignored")
+                    default = next(f.default for f in fields(cls) if f.name == k)
+                    print(f"⚠️  Invalid {k} value '{v}', using default: {default}")
             
             return cls(**validated_data)
-        except ImportError:
-            print("⚠️  PyYAML not installed, using default configuration")
-            return cls()
         except Exception as e:
             print(f"⚠️  Error loading config file: {e}, using default configuration")
             return cls()
@@ -79,10 +104,12 @@ class RouterConfig:
     def to_yaml(self, config_path: Optional[Path] = None) -> bool:
         """Save configuration to YAML file"""
         if config_path is None:
-            config_path = Path.home() / ".router_controller_config.yaml"
+            config_path = _default_config_path()
+        
+        if yaml is None:
+            return False
         
         try:
-            import yaml
             config_dict = {
                 'target_network': self.target_network,
                 'router_url': self.router_url,
@@ -93,12 +120,49 @@ class RouterConfig:
                 'retry_attempts': self.retry_attempts,
                 'retry_delay': self.retry_delay,
                 'enable_notifications': self.enable_notifications,
-                'debug_mode': self.debug_mode
+                'debug_mode': self.debug_mode,
+                'status_ttl_seconds': self.status_ttl_seconds,
+                'use_http_fallback': self.use_http_fallback,
+                'router_ip': self.router_ip,
+                'profile_dir': self.profile_dir,
+                'debugger_address': self.debugger_address,
+                'persistent_browser': self.persistent_browser
             }
             with open(config_path, 'w') as f:
                 yaml.dump(config_dict, f, default_flow_style=False)
             return True
-        except ImportError:
-            return False
         except Exception:
-            return False
\ No newline at end of file
+            return False
+
+
+# Accepted type(s) and value check for each configuration key
+_SCHEMA = {
+    'target_network': (str, lambda v: True),
+    'router_url': (str, lambda v: True),
+    'admin_url': (str, lambda v: True),
+    'timeout': (int, lambda v: not isinstance(v, bool) and v >= 1),
+    'service_name': (str, lambda v: True),
+    'headless': (bool, lambda v: True),
+    'retry_attempts': (int, lambda v: not isinstance(v, bool) and v >= 1),
+    'retry_delay': ((int, float), lambda v: not isinstance(v, bool) and v >= 0),
+    'enable_notifications': (bool, lambda v: True),
+    'debug_mode': (bool, lambda v: True),
+    'status_ttl_seconds': (int, lambda v: not isinstance(v, bool) and v >= 0),
+    'use_http_fallback': (bool, lambda v: True),
+    'router_ip': ((str, type(None)), lambda v: True),
+    'profile_dir': (str, lambda v: True),
+    'debugger_address': ((str, type(None)), lambda v: True),
+    'persistent_browser': (bool, lambda v: True),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _default_config_path() -> Path:
+    """Resolve the default config location once per process"""
+    return Path.home() / ".router_controller_config.yaml"
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config(cls: type, config_path: Path, mtime_ns: int) -> RouterConfig:
+    """Parse a config file once per modification time"""
+    return cls._parse_yaml(config_path)
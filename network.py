@@ -1,28 +1,121 @@
 """Network connectivity verification for router controller"""
 
+import asyncio
+import fcntl
+import re
+import socket
+import struct
 import subprocess
-from typing import TYPE_CHECKING
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+try:
+    import SystemConfiguration
+except ImportError:
+    SystemConfiguration = None
+
+try:
+    import CoreWLAN
+except ImportError:
+    CoreWLAN = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
 if TYPE_CHECKING:
     from .logger import Logger
 
 
+# First non-loopback "inet ..." line in ifconfig output
+_INET_RE = re.compile(rb'^\s*(inet (?!127\.0\.0\.1)\S+.*?)\s*$', re.M)
+
+# Unindented "name:" line that opens each interface section in ifconfig output
+_IFACE_HEADER_RE = re.compile(rb'^([^\s:]+):', re.M)
+
+# Interface flags word, printed in hex as "flags=8863<UP,BROADCAST,...>"
+_FLAGS_RE = re.compile(rb'flags=([0-9a-fA-F]+)<')
+IFF_UP = 0x1
+IFF_RUNNING = 0x40
+IFF_UP_RUNNING = IFF_UP | IFF_RUNNING
+
+# Linux ioctl requests for interface flags and IPv4 address
+SIOCGIFFLAGS = 0x8913
+SIOCGIFADDR = 0x8915
+
+# target_network values that name an interface rather than an SSID
+_INTERFACE_NAME_RE = re.compile(r'(en|eth)\d+')
+
+# Quick reachability check against the router admin page
+ROUTER_ADMIN_PORT = 80
+ROUTER_CONNECT_TIMEOUT = 0.25
+
+# SCNetworkConnectionStatus value for an established connection
+SC_CONNECTION_CONNECTED = 2
+
+
 class NetworkChecker:
     """Network connectivity verification"""
     
-    def __init__(self, logger: 'Logger', target_network: str):
+    def __init__(self, logger: 'Logger', target_network: str, router_ip: Optional[str] = None):
         self.logger = logger
         self.target_network = target_network
+        self.router_ip = router_ip
+        self._vpn_connections: Optional[List] = None
+        self._cache: Optional[Tuple[float, bool]] = None
+        self._ttl = 2.0
+        self._route_events = 0
+        self._route_watcher: Optional[threading.Thread] = None
+        self._wifi_client = CoreWLAN.CWWiFiClient.sharedWiFiClient() if CoreWLAN else None
+    
+    def _vpn_connections_native(self) -> List:
+        """Create SCNetworkConnection handles for every configured service once"""
+        if self._vpn_connections is None:
+            prefs = SystemConfiguration.SCPreferencesCreate(None, "router_controller", None)
+            services = SystemConfiguration.SCNetworkServiceCopyAll(prefs) or []
+            connections = []
+            for service in services:
+                service_id = SystemConfiguration.SCNetworkServiceGetServiceID(service)
+                # Only dial-up/VPN style services yield a connection object
+                connection = SystemConfiguration.SCNetworkConnectionCreateWithServiceID(None, service_id, None, None)
+                if connection is not None:
+                    connections.append(connection)
+            self._vpn_connections = connections
+        return self._vpn_connections
+    
+    def _is_vpn_connected_native(self) -> Optional[bool]:
+        """Query VPN state in-process via SystemConfiguration, or None if unavailable"""
+        if SystemConfiguration is None:
+            return None
+        try:
+            return any(
+                SystemConfiguration.SCNetworkConnectionGetStatus(connection) == SC_CONNECTION_CONNECTED
+                for connection in self._vpn_connections_native()
+            )
+        except Exception as e:
+            self.logger.debug(f"SystemConfiguration VPN check failed: {e}")
+            return None
     
     def is_vpn_connected(self) -> bool:
         """Check if VPN is currently connected"""
+        vpn_connected = self._is_vpn_connected_native()
+        if vpn_connected is not None:
+            if vpn_connected:
+                self.logger.warning("VPN connection detected - please disconnect VPN and try again")
+            else:
+                self.logger.debug("No VPN connection detected")
+            return vpn_connected
+        
         try:
             result = subprocess.run([
                 'scutil', '--nc', 'list'
-            ], capture_output=True, text=True)
+            ], capture_output=True)
             
             if result.returncode == 0:
-                vpn_connected = 'Connected' in result.stdout
+                vpn_connected = b'Connected' in result.stdout
                 if vpn_connected:
                     self.logger.warning("VPN connection detected - please disconnect VPN and try again")
                 else:
@@ -35,66 +128,231 @@ class NetworkChecker:
             self.logger.debug(f"VPN check failed: {e}")
             return False
     
+    def _wifi_ssids_native(self) -> Optional[List[Tuple[str, Optional[str]]]]:
+        """List (interface, SSID) pairs for all Wi-Fi interfaces via CoreWLAN, or None if unavailable"""
+        if self._wifi_client is None:
+            return None
+        try:
+            return [(str(iface.interfaceName()), iface.ssid()) for iface in self._wifi_client.interfaces() or []]
+        except Exception as e:
+            self.logger.debug(f"CoreWLAN query failed: {e}")
+            return None
+    
     def is_connected_to_target_network(self) -> bool:
         """Check if connected to target WiFi network or wired connection"""
+        self._start_route_watcher()
+        
+        # The TTL always bounds a cached result: SSID changes on the same subnet send no routing
+        # message. Route events only drop it sooner
+        now = time.monotonic()
+        if self._cache and now - self._cache[0] < self._ttl:
+            return self._cache[1]
+        
+        events_before = self._route_events
+        connected = self._probe_target_network()
+        if self._route_events == events_before:
+            self._cache = (now, connected)
+        return connected
+    
+    def _start_route_watcher(self):
+        """Lazily start a thread that invalidates the cache early on interface/address changes"""
+        # Only BSD-style PF_ROUTE sockets broadcast link and address changes to unbound listeners
+        if self._route_watcher is not None or sys.platform != 'darwin':
+            return
+        try:
+            route_socket = socket.socket(socket.AF_ROUTE, socket.SOCK_RAW, socket.AF_UNSPEC)
+        except (AttributeError, OSError) as e:
+            self.logger.debug(f"Routing socket unavailable: {e}")
+            return
+        
+        def watch():
+            with route_socket:
+                while True:
+                    try:
+                        route_socket.recv(2048)
+                    except OSError:
+                        return
+                    self._route_events += 1
+                    self._cache = None
+        
+        self._route_watcher = threading.Thread(target=watch, daemon=True)
+        self._route_watcher.start()
+    
+    def invalidate(self):
+        """Forget the cached connection result, e.g. after the router restarts"""
+        self._cache = None
+    
+    def _router_reachable(self) -> bool:
+        """Try a quick TCP connect to the router's admin port"""
+        if not self.router_ip:
+            return False
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.settimeout(ROUTER_CONNECT_TIMEOUT)
+                rc = s.connect_ex((self.router_ip, ROUTER_ADMIN_PORT))
+        except OSError as e:
+            self.logger.debug(f"Router connect check failed: {e}")
+            return False
+        self.logger.debug(f"Router {self.router_ip}:{ROUTER_ADMIN_PORT} connect returned {rc}")
+        return rc == 0
+    
+    def _probe_target_network(self) -> bool:
+        """Query Wi-Fi and wired interfaces for a connection to the router"""
         try:
-            # Check WiFi connection on macOS (try common WiFi interfaces)
-            wifi_interfaces = ['en0', 'en1']
+            # If the router answers directly there is no need to inspect interfaces
+            if self._router_reachable():
+                self.logger.info(f"Router reachable at {self.router_ip}")
+                return True
+            
+            # A target such as "en5" names a wired interface, so probe only that one
+            if _INTERFACE_NAME_RE.fullmatch(self.target_network):
+                wired = self._find_wired_connection(self.target_network)
+                if wired:
+                    interface, ip_info = wired
+                    self.logger.info(f"Connected via wired ethernet on {interface}: {ip_info}")
+                    return True
+                self.logger.warning(f"Interface {self.target_network} is not connected")
+                return False
+            
+            # Check WiFi connection on macOS, in-process when CoreWLAN is available
+            wifi_ssids = self._wifi_ssids_native()
+            for interface, ssid in wifi_ssids or []:
+                if ssid and self.target_network in ssid:
+                    self.logger.info(f"Connected to target WiFi on {interface}: {ssid}")
+                    return True
+            
+            # Fall back to networksetup without CoreWLAN, or where the SSID was withheld
+            # (e.g. no location permission)
+            if wifi_ssids is None:
+                wifi_interfaces = ['en0', 'en1']
+            else:
+                wifi_interfaces = [interface for interface, ssid in wifi_ssids if ssid is None]
+            target_network_bytes = self.target_network.encode('utf-8')
             for interface in wifi_interfaces:
                 try:
                     wifi_result = subprocess.run([
                         'networksetup', '-getairportnetwork', interface
-                    ], capture_output=True, text=True)
+                    ], capture_output=True)
                     
-                    if wifi_result.returncode == 0:
-                        current_network = wifi_result.stdout.strip()
-                        if self.target_network in current_network:
-                            self.logger.info(f"Connected to target WiFi on {interface}: {current_network}")
-                            return True
-                except:
+                    if wifi_result.returncode == 0 and target_network_bytes in wifi_result.stdout:
+                        current_network = wifi_result.stdout.strip().decode('utf-8', 'replace')
+                        self.logger.info(f"Connected to target WiFi on {interface}: {current_network}")
+                        return True
+                except (OSError, subprocess.SubprocessError) as e:
+                    self.logger.debug(f"networksetup failed for {interface}: {e}")
                     continue
             
             # Check all ethernet interfaces for wired connection
-            # Get list of all network interfaces
-            ifconfig_result = subprocess.run(['ifconfig'], capture_output=True, text=True)
-            if ifconfig_result.returncode != 0:
-                self.logger.warning("Failed to get network interface list")
-                return False
-            
-            # Parse interfaces and check each ethernet interface
-            interfaces = []
-            lines = ifconfig_result.stdout.split('\n')
-            for line in lines:
-                if line and not line.startswith('\t') and not line.startswith(' '):
-                    interface_name = line.split(':')[0]
-                    if interface_name.startswith('en'):  # Ethernet interfaces
-                        interfaces.append(interface_name)
-            
-            self.logger.debug(f"Found ethernet interfaces: {interfaces}")
-            
-            for interface in interfaces:
-                try:
-                    wired_result = subprocess.run([
-                        'ifconfig', interface
-                    ], capture_output=True, text=True)
-                    
-                    if wired_result.returncode == 0:
-                        output = wired_result.stdout
-                        # Check if interface is active and has an IP
-                        if ("status: active" in output and "inet " in output) or \
-                           ("flags=" in output and "UP" in output and "inet " in output):
-                            # Extract IP to verify it's in router subnet
-                            for line in output.split('\n'):
-                                if 'inet ' in line and not '127.0.0.1' in line:
-                                    ip_info = line.strip()
-                                    self.logger.info(f"Connected via wired ethernet on {interface}: {ip_info}")
-                                    return True
-                except:
-                    continue
+            wired = self._find_wired_connection()
+            if wired:
+                interface, ip_info = wired
+                self.logger.info(f"Connected via wired ethernet on {interface}: {ip_info}")
+                return True
             
             self.logger.warning("Not connected to target network or wired connection")
             return False
             
         except Exception as e:
             self.logger.error(f"Network check failed: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def _find_wired_connection(self, interface: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """Return (interface, inet info) for an active ethernet link, optionally limited to one interface"""
+        if psutil is not None:
+            return self._find_wired_connection_psutil(interface)
+        if sys.platform.startswith('linux'):
+            return self._find_wired_connection_ioctl(interface)
+        return self._find_wired_connection_ifconfig(interface)
+    
+    def _find_wired_connection_ioctl(self, only: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """Find an active ethernet interface with an IPv4 address via Linux interface ioctls"""
+        interfaces = [
+            name for _, name in socket.if_nameindex()
+            if (name == only if only else name.startswith(('en', 'eth')))
+        ]
+        self.logger.debug(f"Found ethernet interfaces: {interfaces}")
+        
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for interface in interfaces:
+                ifreq = struct.pack('256s', interface.encode()[:15])
+                try:
+                    flags = struct.unpack_from('H', fcntl.ioctl(sock.fileno(), SIOCGIFFLAGS, ifreq), 16)[0]
+                    if flags & IFF_UP_RUNNING != IFF_UP_RUNNING:
+                        continue
+                    # sockaddr_in follows the 16-byte name; the IPv4 address sits at offset 20
+                    address = socket.inet_ntoa(fcntl.ioctl(sock.fileno(), SIOCGIFADDR, ifreq)[20:24])
+                except OSError:
+                    # No IPv4 address assigned (EADDRNOTAVAIL) or interface vanished
+                    continue
+                if address != '127.0.0.1':
+                    return interface, f"inet {address}"
+        return None
+    
+    def _find_wired_connection_psutil(self, only: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """Find an active ethernet interface with an IPv4 address using one getifaddrs call"""
+        stats = psutil.net_if_stats()
+        addrs = psutil.net_if_addrs()
+        
+        interfaces = [name for name in addrs if (name == only if only else name.startswith('en'))]
+        self.logger.debug(f"Found ethernet interfaces: {interfaces}")
+        
+        for interface in interfaces:
+            if interface not in stats or not stats[interface].isup:
+                continue
+            for addr in addrs[interface]:
+                if addr.family == socket.AF_INET and addr.address != '127.0.0.1':
+                    return interface, f"inet {addr.address}"
+        return None
+    
+    def _find_wired_connection_ifconfig(self, only: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """Find an active ethernet interface with an IPv4 address from a single ifconfig run"""
+        try:
+            ifconfig_result = subprocess.run(['ifconfig', only] if only else ['ifconfig'], capture_output=True)
+        except OSError as e:
+            self.logger.warning(f"Failed to get network interface list: {e}")
+            return None
+        if ifconfig_result.returncode != 0:
+            self.logger.warning("Failed to get network interface list")
+            return None
+        
+        # Each interface section starts with an unindented "name:" header line
+        output = ifconfig_result.stdout
+        headers = list(_IFACE_HEADER_RE.finditer(output))
+        interfaces = [m.group(1).decode('ascii', 'replace') for m in headers]
+        interfaces = [name for name in interfaces if (name == only if only else name.startswith('en'))]
+        self.logger.debug(f"Found ethernet interfaces: {interfaces}")
+        
+        for i, header in enumerate(headers):
+            if header.group(1).decode('ascii', 'replace') not in interfaces:
+                continue
+            # Scan the section in place by offsets rather than copying it out of the buffer
+            start = header.start()
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(output)
+            # Check if interface is up and running (one integer test on the parsed flags) and has an IP
+            flags_match = _FLAGS_RE.search(output, start, end)
+            flags = int(flags_match.group(1), 16) if flags_match else 0
+            if flags & IFF_UP_RUNNING == IFF_UP_RUNNING:
+                match = _INET_RE.search(output, start, end)
+                if match:
+                    return header.group(1).decode('ascii', 'replace'), match.group(1).decode('ascii', 'replace')
+        return None
+    
+    async def is_vpn_connected_async(self) -> bool:
+        """Awaitable VPN check that leaves the event loop free while it runs"""
+        return await asyncio.to_thread(self.is_vpn_connected)
+    
+    async def is_connected_to_target_network_async(self) -> bool:
+        """Awaitable target-network check that leaves the event loop free while it runs"""
+        return await asyncio.to_thread(self.is_connected_to_target_network)
+    
+    async def check_all_async(self) -> Tuple[bool, bool]:
+        """Run the VPN and target-network checks concurrently"""
+        vpn_connected, on_target_network = await asyncio.gather(
+            self.is_vpn_connected_async(),
+            self.is_connected_to_target_network_async(),
+        )
+        return vpn_connected, on_target_network
+    
+    def check_all(self) -> Tuple[bool, bool]:
+        """Return (vpn_connected, on_target_network), probing both at once"""
+        return asyncio.run(self.check_all_async())
@@ -1,51 +1,166 @@
 #!/usr/bin/env python3
 """Router 2.4GHz Radio Controller"""
 
-import time
+import json
 from datetime import datetime
-from typing import Optional, Tuple
-
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from pathlib import Path
+from typing import Optional, Tuple, TYPE_CHECKING
+from urllib.parse import urlparse
 
 from models import RadioStatus, ActionResult, RouterConfig
 from logger import Logger
 from network import NetworkChecker
 from credentials import CredentialManager
 from webdriver_manager import WebDriverManager
-from utils import retry, send_notification, format_status_output
+from status_cache import StatusCache
+from http_client import HttpStatusClient
+from utils import retry, send_notification, write_status_output
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from selenium.webdriver.support.ui import WebDriverWait
+
+
+DEBUG_DIR = Path("/tmp")
+DEBUG_WRITE_BUFFER = 1 << 20
+
+# Wireless settings form URL per admin URL, recorded so toggles can open it directly
+FORMFRAME_CACHE = Path.home() / ".cache" / "router_controller" / "formframe.json"
+
+# 2.4GHz status indicator inside the advanced settings tiles
+STATUS_SELECTOR = "#content_icons #title_bgn #words_title div[class^='img_status']"
+
+# Locators for the fixed elements of the SSL interstitial, login and admin pages.
+# Strategies are spelled as selenium's By values so defining them doesn't import selenium
+SSL_ADVANCED = ("id", "details-button")
+SSL_PROCEED = ("id", "proceed-link")
+LOGIN_USERNAME = ("name", "username")
+LOGIN_PASSWORD = ("name", "password")
+LOGIN_BUTTON = ("css selector", "a[onclick*='login']")
+ADVANCED_BUTTON = ("id", "advanced_bt")
+CONTENT_ICONS = ("id", "content_icons")
+WIRELESS_LINK = ("id", "wladv")
+FORMFRAME = ("name", "formframe")
+RADIO_CHECKBOX = ("id", "enable_ap")
+
+# Returns the 2.4GHz status indicator class from the top document or any same-origin frame
+JS_RADIO_STATUS_CLASS = f"""(() => {{
+    const docs = [document];
+    for (const frame of document.querySelectorAll('iframe, frame')) {{
+        try {{ if (frame.contentDocument) docs.push(frame.contentDocument); }} catch (e) {{}}
+    }}
+    for (const doc of docs) {{
+        const el = doc.querySelector("{STATUS_SELECTOR}");
+        if (el) return el.className;
+    }}
+    return null;
+}})()"""
+
+# Returns the class of the first element matching a selector in the current frame, or null
+JS_QUERY_CLASS = "const e = document.querySelector(arguments[0]); return e ? e.className : null;"
+
+# Locates #content_icons: {frame: name, id or index} for a same-origin iframe, {frame: null} for the
+# top document, or null while it has not rendered yet
+JS_CONTENT_FRAME = """
+const frames = document.querySelectorAll('iframe');
+for (let i = 0; i < frames.length; i++) {
+    try {
+        const doc = frames[i].contentDocument;
+        if (doc && doc.getElementById('content_icons')) return {frame: frames[i].name || frames[i].id || i};
+    } catch (e) {}
+}
+return document.getElementById('content_icons') ? {frame: null} : null;
+"""
+
+# Fills the login form and clicks the login link after returning [link, url before submit]
+JS_SUBMIT_LOGIN = """
+const form = {username: arguments[0], password: arguments[1]};
+for (const name in form) {
+    const field = document.getElementsByName(name)[0];
+    field.value = form[name];
+    field.dispatchEvent(new Event('input', {bubbles: true}));
+    field.dispatchEvent(new Event('change', {bubbles: true}));
+}
+const link = document.querySelector(arguments[2]);
+setTimeout(() => link.click(), 0);
+return [link, location.href];
+"""
+
+# Reports which lowercase terms appear in the serialized page without sending it over the wire
+JS_FIND_TERMS = (
+    "const t = document.documentElement.outerHTML.toLowerCase(); "
+    "return arguments[0].map(x => t.includes(x));"
+)
+
+# Multi-login "Yes" button candidates, most specific first
+YES_SELECTORS = (
+    "#yes",  # Primary: the actual Yes button ID
+    "div[onclick*='login']",  # The Yes button has onclick="login()"
+    "input[value*='Yes']",
+    "input[value*='yes']",
+    "input[value*='OK']",
+    "button[type='submit']",
+    "input[type='submit']",
+)
+
+# Fallbacks for the "Enable Wireless Router Radio" checkbox when #enable_ap is missing
+CHECKBOX_SELECTORS = (
+    "input[name='enable_ap']",
+    "input[type='checkbox'][value='1']",
+    "tr#ap_bgn input[type='checkbox']",
+)
+
+# Apply button candidates on the wireless settings form
+APPLY_SELECTORS = (
+    "#apply",
+    "input[value='Apply']",
+    "input[type='submit'][value*='Apply']",
+    "button[value*='Apply']",
+)
+
+# Returns the first element matching the selectors in priority order, in a single round trip
+JS_FIND_FIRST = (
+    "for (const s of arguments[0]) { const e = document.querySelector(s); if (e) return e; } "
+    "return null;"
+)
+
+# Walks the DOM once and returns a summary of every element matching the given CSS selectors
+JS_COLLECT = (
+    "return Array.from(document.querySelectorAll(arguments[0].join(','))).slice(0, 50).map(e => ({"
+    "tag: e.tagName, id: e.id, cls: e.className, "
+    "parent: e.parentElement ? e.parentElement.id : '', "
+    "text: (e.innerText || '').slice(0, 80)}));"
+)
+
+
+def _import_selenium():
+    """Import selenium on first browser use, so --help and cached status lookups never load it"""
+    global By, WebDriverWait, EC, TimeoutException, WebDriverException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, WebDriverException
 
 
 class RouterController:
     """Main controller for router radio management"""
     
-    # Reusable CSS selectors for better performance
-    SELECTORS = {
-        'ssl_advanced': '#details-button',
-        'ssl_proceed': '#proceed-link',
-        'login_username': '[name="username"]',
-        'login_password': '[name="password"]',
-        'login_button': 'a[onclick*="login"]',
-        'advanced_button': '#advanced_bt',
-        'content_icons': '#content_icons',
-        'wireless_bgn': '#title_bgn',
-        'wireless_status': '#words_title div[class*="img_status"]',
-        'wireless_link': '#wladv',
-        'formframe': '[name="formframe"]',
-        'radio_checkbox': '#enable_ap',
-        'apply_button': '#apply'
-    }
-    
     def __init__(self, config: RouterConfig = None):
         self.config = config or RouterConfig.from_yaml()
         self.logger = Logger(dynamic=not self.config.debug_mode)
-        self.network_checker = NetworkChecker(self.logger, self.config.target_network)
+        self.network_checker = NetworkChecker(self.logger, self.config.target_network, self.config.router_ip)
         self.credential_manager = CredentialManager(self.logger, self.config.service_name)
-        self.webdriver_manager = WebDriverManager(self.logger, self.config.headless, self.config.debug_mode)
-        self.driver: Optional[webdriver.Chrome] = None
+        self.webdriver_manager = WebDriverManager(
+            self.logger, self.config.headless, self.config.debug_mode, self.config.profile_dir,
+            self.config.debugger_address, self.config.persistent_browser
+        )
+        self.status_cache = StatusCache(self.config.status_ttl_seconds)
+        self.http_client = HttpStatusClient(self.logger, self.config.timeout)
+        self.driver: Optional['webdriver.Chrome'] = None
+        self._logged_in = False
+        self._on_advanced = False
+        self._formframe_url = self._load_formframe_url()
+        self._creds: Optional[Tuple[str, str]] = None
     
     def __enter__(self):
         """Context manager entry"""
@@ -54,23 +169,26 @@ class RouterController:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit with cleanup"""
         self.logger.clear_line()  # Clear dynamic log line
-        self.webdriver_manager.cleanup()
+        self.webdriver_manager.cleanup(ok=exc_type is None)
     
     def _ensure_network_connection(self) -> tuple[bool, str]:
         """Verify network connectivity and VPN status"""
-        if self.network_checker.is_vpn_connected():
+        vpn_connected, on_target_network = self.network_checker.check_all()
+        if vpn_connected:
             return False, "VPN_CONNECTED"
-        if not self.network_checker.is_connected_to_target_network():
+        if not on_target_network:
             self.logger.error("Not connected to target network")
             return False, "NOT_CONNECTED_TO_ROUTER"
         return True, "OK"
     
     def _get_credentials(self) -> Tuple[str, str]:
-        """Get admin credentials"""
-        username, password = self.credential_manager.get_credentials()
-        if not username or not password:
-            username, password = self.credential_manager.prompt_for_credentials()
-        return username, password
+        """Get admin credentials, looking them up or prompting once per controller"""
+        if self._creds is None:
+            username, password = self.credential_manager.get_credentials()
+            if not username or not password:
+                username, password = self.credential_manager.prompt_for_credentials()
+            self._creds = (username, password)
+        return self._creds
     
     def _find_element_in_frames(self, selector: str, max_wait: int = 5):
         """Efficiently find element across main page and iframes"""
@@ -98,32 +216,100 @@ class RouterController:
         
         raise TimeoutException(f"Element {selector} not found in main page or iframes")
     
+    def _find_first(self, selectors):
+        """Return the first element matching selectors in priority order, or None"""
+        return self.driver.execute_script(JS_FIND_FIRST, list(selectors))
+    
+    def _save_debug_snapshot(self, name: str, description: str):
+        """Save an MHTML snapshot of the current page (including frames) in debug mode"""
+        # Checked before touching the driver so the page is never fetched outside debug mode
+        if not self.config.debug_mode:
+            return
+        
+        path = DEBUG_DIR / f"{name}.mhtml"
+        try:
+            try:
+                data = self.driver.execute_cdp_cmd("Page.captureSnapshot", {"format": "mhtml"})["data"]
+            except Exception:
+                # Fall back to the serialized DOM if the CDP snapshot is unavailable
+                path = path.with_suffix(".html")
+                data = self.driver.page_source
+            with open(path, 'w', buffering=DEBUG_WRITE_BUFFER) as f:
+                f.write(data)
+        except Exception as e:
+            self.logger.debug(f"Could not save {description.lower()}: {e}")
+            return
+        self.logger.info(f"DEBUG: {description} saved to {path}")
+    
     def _initialize_driver(self):
         """Initialize WebDriver if needed"""
         if not self.driver:
+            _import_selenium()
             self.driver = self.webdriver_manager.create_driver()
     
+    def _reset_session(self):
+        """Force the next action to log in and navigate again"""
+        self._logged_in = False
+        self._on_advanced = False
+    
+    def _is_session_alive(self) -> bool:
+        """Whether the driver is still showing the logged-in advanced settings page"""
+        try:
+            self.driver.switch_to.default_content()
+            # Only the path counts; the router's own host is routerlogin.net
+            if "login" in urlparse(self.driver.current_url).path.lower():
+                return False
+            # execute_script runs a function body, so the expression's value must be returned explicitly
+            return bool(self.driver.execute_script("return " + JS_RADIO_STATUS_CLASS))
+        except Exception as e:
+            self.logger.debug(f"Session check failed: {e}")
+            return False
+    
+    def _ensure_logged_in(self) -> bool:
+        """Log in unless this controller already holds a router session"""
+        self._initialize_driver()
+        if not self._logged_in:
+            self._logged_in = self._login_to_router()
+        return self._logged_in
+    
+    def _open_advanced_settings(self) -> bool:
+        """Log in and open advanced settings, reusing the current session when it is still valid"""
+        self._initialize_driver()
+        
+        if self._on_advanced and self._is_session_alive():
+            self.logger.info("Reusing logged-in advanced settings session")
+            return True
+        
+        if not self._ensure_logged_in():
+            return False
+        
+        self._on_advanced = self._navigate_to_advanced_settings()
+        if not self._on_advanced:
+            # The session may have expired on the router; log in again next time
+            self._logged_in = False
+        return self._on_advanced
+    
     def _handle_ssl_warning(self) -> bool:
         """Handle Chrome SSL certificate warning page"""
         try:
             wait = WebDriverWait(self.driver, 5)  # Shorter timeout for SSL check
             
-            # Check if we're on the SSL warning page
-            if "Your connection is not private" in self.driver.page_source:
+            # Chrome's interstitial is the only page with an "Advanced" details button
+            if self.driver.find_elements(*SSL_ADVANCED):
                 self.logger.info("SSL certificate warning detected, proceeding through warning")
                 
                 # Click "Advanced" button
-                advanced_button = wait.until(EC.element_to_be_clickable((By.ID, "details-button")))
+                advanced_button = wait.until(EC.element_to_be_clickable(SSL_ADVANCED))
                 advanced_button.click()
                 self.logger.debug("Clicked Advanced button")
                 
                 # Click "Proceed to routerlogin.net (unsafe)" link
-                proceed_link = wait.until(EC.element_to_be_clickable((By.ID, "proceed-link")))
+                proceed_link = wait.until(EC.element_to_be_clickable(SSL_PROCEED))
                 proceed_link.click()
                 self.logger.info("Clicked proceed link, bypassing SSL warning")
                 
-                # Wait for page to change after SSL bypass
-                wait.until(lambda driver: "Your connection is not private" not in driver.page_source)
+                # Wait for the interstitial to be replaced by the router page
+                wait.until(EC.staleness_of(proceed_link))
                 
                 return True
             
@@ -141,86 +327,71 @@ class RouterController:
         """Login to router admin panel"""
         try:
             self.logger.info("Navigating to router login page")
-            self.driver.get(self.config.router_url)
+            self._navigate(self.config.router_url)
             
             # Handle potential SSL certificate warning
             if not self._handle_ssl_warning():
                 self.logger.error("Failed to handle SSL warning")
                 return False
             
+            # A session cookie from the persisted Chrome profile lands straight on the admin page
+            if self.driver.find_elements(*ADVANCED_BUTTON):
+                self.logger.info("Already logged in from a previous session")
+                return True
+            
             username, password = self._get_credentials()
             
             # Wait for and fill login form
             wait = WebDriverWait(self.driver, self.config.timeout)
-            username_field = wait.until(EC.presence_of_element_located((By.NAME, "username")))
-            password_field = self.driver.find_element(By.NAME, "password")
-            
-            username_field.send_keys(username)
-            password_field.send_keys(password)
-            
-            # Submit login - Router uses <a> tag with onclick, not input[type='submit']
-            login_button = self.driver.find_element(By.CSS_SELECTOR, "a[onclick*='login']")
-            login_button.click()
+            wait.until(EC.presence_of_element_located(LOGIN_USERNAME))
             
+            # Fill both fields and submit in one script call - Router uses <a> tag with onclick, not input[type='submit']
+            login_button, pre_login_url = self.driver.execute_script(
+                JS_SUBMIT_LOGIN, username, password, LOGIN_BUTTON[1])
+
             self.logger.info("Login submitted, waiting for page load")
-            
-            # Wait for the page to actually change after login submission
-            # The router needs time to process login and redirect
-            time.sleep(2)
-            
+
+            # Wait for the router to process login and redirect, then for the new document to finish loading
+            wait.until(lambda driver: driver.current_url != pre_login_url or EC.staleness_of(login_button)(driver))
+            wait.until(lambda driver: driver.execute_script("return document.readyState") == "complete")
+
             # Wait for either admin panel or multi-login page to load
-            wait.until(lambda driver: any(indicator in driver.page_source.lower() 
-                                        for indicator in ['advanced', 'setup', 'wireless', 'multi_login']))
+            wait.until(lambda driver: any(driver.execute_script(
+                JS_FIND_TERMS, ['advanced', 'setup', 'wireless', 'multi_login'])))
             
             # Check if we got redirected to multi-login page
-            current_url = self.driver.current_url
-            if "multi_login" in current_url.lower():
+            current_url = self.driver.current_url.lower()
+            if "multi_login" in current_url:
                 self.logger.info("Multi-login detected, handling concurrent session...")
                 
-                # Debug: save multi-login page
-                if self.config.debug_mode:
-                    with open('/tmp/multi_login_debug.html', 'w') as f:
-                        f.write(self.driver.page_source)
-                    self.logger.info("DEBUG: Multi-login page saved to /tmp/multi_login_debug.html")
-                
                 try:
                     # Look for "Yes" button to kick out other session (based on actual multi-login page)
-                    yes_selectors = [
-                        "#yes",  # Primary: the actual Yes button ID
-                        "div[onclick*='login']",  # The Yes button has onclick="login()"
-                        "div:contains('Yes')",  # Fallback: any div containing "Yes"
-                        "input[value*='Yes']",
-                        "input[value*='yes']", 
-                        "input[value*='OK']",
-                        "button[type='submit']",
-                        "input[type='submit']"
-                    ]
-                    
-                    for selector in yes_selectors:
-                        try:
-                            yes_button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                            yes_button.click()
-                            self.logger.info(f"Clicked proceed button: {selector}")
-                            # Wait for page to change after multi-login handling
-                            wait.until(lambda driver: "multi_login" not in driver.current_url.lower())
-                            new_url = self.driver.current_url
-                            self.logger.info(f"After multi-login handling, current URL: {new_url}")
-                            break
-                        except:
-                            continue
-                            
+                    yes_button = self._find_first(YES_SELECTORS)
+                    if yes_button:
+                        yes_button.click()
+                        self.logger.info("Clicked proceed button on multi-login page")
+                        # Wait for page to change after multi-login handling
+                        wait.until(lambda driver: "multi_login" not in driver.current_url.lower())
+                        new_url = self.driver.current_url
+                        self.logger.info(f"After multi-login handling, current URL: {new_url}")
+                        current_url = new_url.lower()
+                    else:
+                        self.logger.warning("No proceed button found on multi-login page")
+                        self._save_debug_snapshot("multi_login_debug", "Multi-login page")
+                        
                 except Exception as e:
                     self.logger.warning(f"Failed to handle multi-login: {e}")
+                    self._save_debug_snapshot("multi_login_debug", "Multi-login page")
                     
-            # Final success check: look for admin panel indicators first
-            if any(indicator in self.driver.page_source.lower() for indicator in ['advanced', 'setup', 'wireless', 'router']):
+            # Final success check: the admin panel's Advanced tab
+            if self.driver.find_elements(*ADVANCED_BUTTON):
                 self.logger.info("Successfully logged into admin panel")
                 return True
             
             # Check if we're still on login page (login failed)
-            elif "login" in current_url.lower():
+            elif "login" in current_url:
                 # Additional check: make sure we're actually on login page, not just a URL with "login" in it
-                if self.driver.find_elements(By.NAME, "username") and self.driver.find_elements(By.NAME, "password"):
+                if self.driver.find_elements(*LOGIN_USERNAME) and self.driver.find_elements(*LOGIN_PASSWORD):
                     self.logger.warning("Still on login page after submission, login may have failed")
                     return False
                 
@@ -237,110 +408,98 @@ class RouterController:
         """Navigate to advanced settings page"""
         try:
             self.logger.info("Navigating to advanced settings")
-            self.driver.get(self.config.admin_url)
+            self._navigate(self.config.admin_url)
             
             wait = WebDriverWait(self.driver, self.config.timeout)
             
             # Expand Advanced Setup
             try:
                 advanced_button = wait.until(
-                    EC.element_to_be_clickable((By.ID, "advanced_bt"))
+                    EC.element_to_be_clickable(ADVANCED_BUTTON)
                 )
                 advanced_button.click()
             except Exception as e:
                 self.logger.error(f"Failed to find Advanced Setup button: {e}")
-                if self.config.debug_mode:
-                    # Debug: save page to see what we're actually looking at
-                    with open('/tmp/admin_page_debug.html', 'w') as f:
-                        f.write(self.driver.page_source)
-                    self.logger.info("DEBUG: Admin page saved to /tmp/admin_page_debug.html")
+                # Debug: save page to see what we're actually looking at
+                self._save_debug_snapshot("admin_page_debug", "Admin page")
                 raise
             self.logger.info("Advanced Setup button clicked, waiting for content to load...")
             
-            # Check iframes first (where content typically loads for this router)
-            iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-            for i, iframe in enumerate(iframes):
-                try:
-                    self.logger.debug(f"Checking iframe {i}")
-                    self.driver.switch_to.frame(iframe)
-                    # Use shorter wait since we know content loads quickly
-                    iframe_wait = WebDriverWait(self.driver, 6)
-                    iframe_wait.until(EC.presence_of_element_located((By.ID, "content_icons")))
-                    self.logger.info(f"Advanced settings content found in iframe {i}")
-                    return True
-                except:
-                    self.driver.switch_to.default_content()
-                    continue
-            
-            # Fallback: try main page if not found in iframes
-            self.logger.debug("content_icons not in iframes, checking main page...")
-            quick_wait = WebDriverWait(self.driver, 3)
-            try:
-                quick_wait.until(EC.presence_of_element_located((By.ID, "content_icons")))
+            # Poll every frame in one script call, then switch straight to the one holding the content
+            location = wait.until(lambda driver: driver.execute_script(JS_CONTENT_FRAME))
+            if location['frame'] is None:
                 self.logger.info("Advanced settings content loaded in main page")
-                return True
-            except:
-                pass
-            
-            # Final fallback with longer wait
-            self.logger.debug("Trying longer wait as final fallback...")
-            long_wait = WebDriverWait(self.driver, 10)
-            long_wait.until(EC.presence_of_element_located((By.ID, "content_icons")))
-            self.logger.info("Advanced settings content loaded (fallback)")
+            else:
+                self.driver.switch_to.frame(location['frame'])
+                self.logger.info(f"Advanced settings content found in iframe {location['frame']}")
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to navigate to advanced settings: {e}")
             return False
     
+    def _navigate(self, url: str):
+        """Load a URL in the top frame with CDP Page.navigate, falling back to driver.get"""
+        self.driver.switch_to.default_content()
+        try:
+            result = self.driver.execute_cdp_cmd("Page.navigate", {"url": url})
+        except Exception as e:
+            self.logger.debug(f"CDP navigation failed, using driver.get: {e}")
+            self.driver.get(url)
+            return
+        
+        # Certificate errors load an interstitial that _handle_ssl_warning clicks through;
+        # anything else (refused, unresolved) fails now like driver.get would
+        error_text = result.get("errorText")
+        if error_text:
+            if not error_text.startswith("net::ERR_CERT_"):
+                raise WebDriverException(f"Navigation to {url} failed: {error_text}")
+            self.logger.debug(f"Navigation to {url} reported {error_text}")
+        
+        # Page.navigate returns once the new document is committed; wait until it has been parsed
+        WebDriverWait(self.driver, self.config.timeout).until(
+            lambda driver: driver.execute_script("return document.readyState") != "loading")
+    
+    def _evaluate_cdp(self, expression: str):
+        """Evaluate an expression in the page via CDP Runtime.evaluate, returning None on failure"""
+        try:
+            result = self.driver.execute_cdp_cmd(
+                "Runtime.evaluate", {"expression": expression, "returnByValue": True}
+            )
+            return result.get("result", {}).get("value")
+        except Exception as e:
+            self.logger.debug(f"CDP evaluation failed: {e}")
+            return None
+    
+    def _find_status_class(self) -> str:
+        """Locate the 2.4GHz status indicator with Selenium and return its class"""
+        self.logger.debug("Looking for 2.4GHz Wireless Settings status in content area...")
+        
+        # One compound selector: content_icons > title_bgn (2.4GHz tile) > words_title > img_status_*
+        status_class = self.driver.execute_script(JS_QUERY_CLASS, STATUS_SELECTOR)
+        if not status_class:
+            # The advanced section usually renders inside the first iframe
+            iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
+            if not iframes:
+                raise Exception("No status indicator or iframes found")
+            self.logger.debug(f"Found {len(iframes)} iframes, switching to first one")
+            self.driver.switch_to.frame(iframes[0])
+            try:
+                status_class = WebDriverWait(self.driver, 3).until(
+                    lambda driver: driver.execute_script(JS_QUERY_CLASS, STATUS_SELECTOR))
+            except TimeoutException:
+                self.driver.switch_to.default_content()
+                raise Exception("Status indicator not found in iframe either")
+        
+        return status_class
+    
     def _get_radio_status_from_ui(self) -> RadioStatus:
         """Check radio status from UI elements"""
         try:
-            wait = WebDriverWait(self.driver, self.config.timeout)
-            
-            # Debug: Save page source for inspection
-            if self.config.debug_mode:
-                with open('/tmp/router_admin_page_debug.html', 'w') as f:
-                    f.write(self.driver.page_source)
-                self.logger.info("DEBUG: Admin page source saved to /tmp/router_admin_page_debug.html")
-            
-            self.logger.debug("Looking for 2.4GHz Wireless Settings status in content area...")
-            
-            # First try to find content_icons div which contains all the status information
-            try:
-                content_div = self.driver.find_element(By.ID, "content_icons")
-                self.logger.debug("Found content_icons div")
-            except:
-                # If content_icons not found, the advanced section may not be expanded yet
-                # Try to wait a bit more or look for it in frames
-                self.logger.debug("content_icons not found, checking for iframe/frame")
-                
-                # Check if there's an iframe we need to switch to
-                iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-                if iframes:
-                    self.logger.debug(f"Found {len(iframes)} iframes, switching to first one")
-                    self.driver.switch_to.frame(iframes[0])
-                    # Wait for content to load in the iframe
-                    WebDriverWait(self.driver, 3).until(EC.presence_of_element_located((By.ID, "content_icons")))
-                    try:
-                        content_div = self.driver.find_element(By.ID, "content_icons")
-                        self.logger.debug("Found content_icons in iframe")
-                    except:
-                        self.driver.switch_to.default_content()
-                        raise Exception("content_icons not found in iframe either")
-                else:
-                    raise Exception("No content_icons div or iframes found")
-            
-            # Now look for the 2.4GHz wireless settings within content_icons
-            # Based on your HTML: <div id="title_bgn" class="adv_icon">
-            wireless_section = content_div.find_element(By.ID, "title_bgn")
-            self.logger.debug("Found title_bgn section (2.4GHz Wireless Settings)")
-            
-            # Look for the status indicator within this section
-            # Structure: <div id="words_title" class="title_doubleline">...<div class="img_status_*"></div>
-            title_div = wireless_section.find_element(By.ID, "words_title")
-            status_element = title_div.find_element(By.XPATH, ".//div[starts-with(@class, 'img_status')]")
-            status_class = status_element.get_attribute("class")
+            # Resolve the status class in one CDP evaluation, falling back to a Selenium element walk
+            status_class = self._evaluate_cdp(JS_RADIO_STATUS_CLASS)
+            if not status_class:
+                status_class = self._find_status_class()
             
             self.logger.debug(f"Found status element with class: {status_class}")
             
@@ -356,103 +515,160 @@ class RouterController:
                 return RadioStatus.RADIO_OFF
             else:
                 self.logger.warning(f"Unexpected status class: {status_class}")
+                self._save_debug_snapshot("router_admin_page_debug", "Admin page snapshot")
                 return RadioStatus.UNEXPECTED_FAILURE
                 
         except Exception as e:
             self.logger.error(f"Failed to check radio status: {e}")
+            self._reset_session()
             if self.config.debug_mode:
                 import traceback
                 self.logger.debug(f"Full traceback: {traceback.format_exc()}")
+                self._save_debug_snapshot("router_admin_page_debug", "Admin page snapshot")
                 
-                # Additional debug: try to find any img_status elements
+                # Additional debug: collect any img_status elements in a single script call
                 try:
-                    status_elements = self.driver.find_elements(By.XPATH, "//*[contains(@class, 'img_status')]")
+                    status_elements = self.driver.execute_script(JS_COLLECT, ["[class*='img_status']"])
                     self.logger.debug(f"Found {len(status_elements)} img_status elements total")
                     for i, elem in enumerate(status_elements[:5]):
-                        self.logger.debug(f"  Status element {i}: class='{elem.get_attribute('class')}', parent='{elem.find_element(By.XPATH, '..').get_attribute('id')}'")
+                        self.logger.debug(f"  Status element {i}: class='{elem['cls']}', parent='{elem['parent']}'")
                 except Exception as debug_e:
                     self.logger.debug(f"Debug search failed: {debug_e}")
                     
             return RadioStatus.UNEXPECTED_FAILURE
     
+    def _open_wireless_form(self, wait: 'WebDriverWait') -> bool:
+        """Load the wireless settings form, deep-linking to it when its URL is already known"""
+        if self._formframe_url and self._logged_in:
+            self._on_advanced = False
+            self._navigate(self._formframe_url)
+            try:
+                WebDriverWait(self.driver, 3).until(EC.presence_of_element_located(RADIO_CHECKBOX))
+                self.logger.info("Opened wireless settings directly")
+                return True
+            except TimeoutException:
+                self.logger.debug("Cached wireless settings URL did not load the form, using the menu")
+                if self.driver.find_elements(*LOGIN_USERNAME):
+                    self._logged_in = False
+        
+        if not self._open_advanced_settings():
+            return False
+        # The menu click below leaves the advanced settings view
+        self._on_advanced = False
+        
+        # First, make sure we have the content area loaded (same as status check)
+        try:
+            content_div = self.driver.find_element(*CONTENT_ICONS)
+            self.logger.debug("Found content_icons div for toggle")
+        except:
+            # Check if content is in an iframe
+            iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
+            if iframes:
+                self.logger.debug(f"Switching to iframe for toggle")
+                self.driver.switch_to.frame(iframes[1])  # Usually the content iframe
+                try:
+                    # Poll briefly in case the frame is still rendering
+                    content_div = WebDriverWait(self.driver, 2).until(EC.presence_of_element_located(CONTENT_ICONS))
+                    self.logger.debug("Found content_icons in iframe for toggle")
+                except TimeoutException:
+                    self.driver.switch_to.default_content()
+                    raise Exception("content_icons not found for toggle")
+            else:
+                raise Exception("No content_icons div found for toggle")
+        
+        # Click on the "Wireless Settings" link in the navigation menu
+        # Based on HTML: <dt id="wladv" class="middle_name"><a target="formframe" onclick="click_adv_action('wladv');">
+        # First switch back to default content to access the navigation menu
+        self.driver.switch_to.default_content()
+        
+        self.logger.info("Clicking Wireless Settings link to navigate to configuration page")
+        wireless_link = wait.until(EC.element_to_be_clickable(WIRELESS_LINK))
+        wireless_link.click()
+        
+        # The wireless configuration form loads into a frame called "formframe"
+        # Switch to the formframe to access the actual wireless settings
+        try:
+            self.logger.debug("Switching to formframe to access wireless configuration")
+            formframe = wait.until(EC.presence_of_element_located(FORMFRAME))
+            self.driver.switch_to.frame(formframe)
+            # Wait for the form content (checkbox) to load
+            wait.until(EC.presence_of_element_located(RADIO_CHECKBOX))
+        except Exception as e:
+            self.logger.warning(f"Could not find formframe: {e}")
+            # Try by index if name doesn't work
+            iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
+            for i, iframe in enumerate(iframes):
+                if "form" in iframe.get_attribute("name").lower():
+                    self.driver.switch_to.frame(iframe)
+                    self.logger.debug(f"Switched to iframe {i} for wireless config")
+                    # Wait for the form content to load
+                    wait.until(EC.presence_of_element_located(RADIO_CHECKBOX))
+                    break
+        
+        if self.driver.find_elements(*RADIO_CHECKBOX):
+            self._save_formframe_url(self.driver.execute_script("return location.href"))
+        return True
+    
+    def _load_formframe_url(self) -> Optional[str]:
+        """Read the wireless settings URL recorded for this router by a previous run"""
+        try:
+            with open(FORMFRAME_CACHE, 'r') as f:
+                return json.load(f).get(self.config.admin_url)
+        except (OSError, ValueError, AttributeError):
+            return None
+    
+    def _save_formframe_url(self, url: str):
+        """Remember the wireless settings URL so later toggles can skip the menu"""
+        if url == self._formframe_url:
+            return
+        self._formframe_url = url
+        try:
+            FORMFRAME_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            with open(FORMFRAME_CACHE, 'w') as f:
+                json.dump({self.config.admin_url: url}, f)
+        except OSError as e:
+            self.logger.debug(f"Could not save wireless settings URL: {e}")
+    
+    def _known_radio_status(self) -> Optional[RadioStatus]:
+        """Radio status read live from the advanced view this controller already has open"""
+        # The shared on-disk status cache is not trusted here; another tool may have toggled the radio since
+        if self._on_advanced and self._is_session_alive():
+            return self._get_radio_status_from_ui()
+        return None
+    
     def _toggle_radio(self, enable: bool) -> ActionResult:
         """Toggle radio on/off"""
+        # Skip the wireless form entirely when the radio is already known to be in the requested state
+        status = self._known_radio_status()
+        if enable and status == RadioStatus.RADIO_ON:
+            self.logger.info("Radio already enabled")
+            return ActionResult.ALREADY_ON
+        if not enable and status == RadioStatus.RADIO_OFF:
+            self.logger.info("Radio already disabled")
+            return ActionResult.ALREADY_OFF
+        
+        if not self._ensure_logged_in():
+            return ActionResult.UNEXPECTED_FAILURE
+        
         try:
             wait = WebDriverWait(self.driver, self.config.timeout)
             
-            # First, make sure we have the content area loaded (same as status check)
-            try:
-                content_div = self.driver.find_element(By.ID, "content_icons")
-                self.logger.debug("Found content_icons div for toggle")
-            except:
-                # Check if content is in an iframe
-                iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-                if iframes:
-                    self.logger.debug(f"Switching to iframe for toggle")
-                    self.driver.switch_to.frame(iframes[1])  # Usually the content iframe
-                    try:
-                        content_div = self.driver.find_element(By.ID, "content_icons")
-                        self.logger.debug("Found content_icons in iframe for toggle")
-                    except:
-                        self.driver.switch_to.default_content()
-                        raise Exception("content_icons not found for toggle")
-                else:
-                    raise Exception("No content_icons div found for toggle")
-            
-            # Click on the "Wireless Settings" link in the navigation menu
-            # Based on HTML: <dt id="wladv" class="middle_name"><a target="formframe" onclick="click_adv_action('wladv');">
-            # First switch back to default content to access the navigation menu
-            self.driver.switch_to.default_content()
-            
-            self.logger.info("Clicking Wireless Settings link to navigate to configuration page")
-            wireless_link = wait.until(EC.element_to_be_clickable((By.ID, "wladv")))
-            wireless_link.click()
-            
-            # The wireless configuration form loads into a frame called "formframe"
-            # Switch to the formframe to access the actual wireless settings
-            try:
-                self.logger.debug("Switching to formframe to access wireless configuration")
-                formframe = wait.until(EC.presence_of_element_located((By.NAME, "formframe")))
-                self.driver.switch_to.frame(formframe)
-                # Wait for the form content (checkbox) to load
-                wait.until(EC.presence_of_element_located((By.ID, "enable_ap")))
-            except Exception as e:
-                self.logger.warning(f"Could not find formframe: {e}")
-                # Try by index if name doesn't work
-                iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-                for i, iframe in enumerate(iframes):
-                    if "form" in iframe.get_attribute("name").lower():
-                        self.driver.switch_to.frame(iframe)
-                        self.logger.debug(f"Switched to iframe {i} for wireless config")
-                        # Wait for the form content to load
-                        wait.until(EC.presence_of_element_located((By.ID, "enable_ap")))
-                        break
+            if not self._open_wireless_form(wait):
+                raise Exception("Could not open wireless settings")
             
             # Now we should be in the wireless configuration frame
             # Look for the "Enable Wireless Router Radio" checkbox
             # Based on HTML: <input type="checkbox" name="enable_ap" id="enable_ap" value="1" onclick="check_schedule_onoff();">
             self.logger.debug("Looking for Enable Wireless Router Radio checkbox")
             try:
-                checkbox = wait.until(EC.presence_of_element_located((By.ID, "enable_ap")))
+                checkbox = wait.until(EC.presence_of_element_located(RADIO_CHECKBOX))
                 self.logger.debug("Found radio enable checkbox with ID: enable_ap")
             except:
-                # Fallback selectors
-                checkbox_selectors = [
-                    "input[name='enable_ap']",
-                    "input[type='checkbox'][value='1']",
-                    "tr#ap_bgn input[type='checkbox']"
-                ]
-                
-                checkbox = None
-                for selector in checkbox_selectors:
-                    try:
-                        checkbox = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        self.logger.debug(f"Found radio enable checkbox using fallback: {selector}")
-                        break
-                    except:
-                        continue
-                
-                if not checkbox:
+                # Fallback selectors, resolved in a single script call
+                checkbox = self._find_first(CHECKBOX_SELECTORS)
+                if checkbox:
+                    self.logger.debug("Found radio enable checkbox using fallback selectors")
+                else:
                     raise Exception("Could not find radio enable checkbox")
             
             is_currently_enabled = checkbox.is_selected()
@@ -467,54 +683,25 @@ class RouterController:
             
             # Toggle checkbox if needed
             if is_currently_enabled != enable:
-                # The checkbox has a label that intercepts clicks, so we'll click the label instead
-                # or use JavaScript to click the checkbox directly
-                try:
-                    # Try clicking the label first (more reliable)
-                    label = self.driver.find_element(By.CSS_SELECTOR, "label[for='enable_ap']")
-                    label.click()
-                    self.logger.info(f"Radio checkbox {'enabled' if enable else 'disabled'} (clicked label)")
-                except:
-                    # Fallback: use JavaScript to click the checkbox directly
-                    self.driver.execute_script("arguments[0].click();", checkbox)
-                    self.logger.info(f"Radio checkbox {'enabled' if enable else 'disabled'} (used JavaScript)")
+                # The checkbox has a label that intercepts pointer clicks, so click it from JavaScript;
+                # this flips it and runs its check_schedule_onoff() handler in one call
+                self.driver.execute_script("arguments[0].click();", checkbox)
+                self.logger.info(f"Radio checkbox {'enabled' if enable else 'disabled'}")
             
             # Apply changes - look for Apply button
-            apply_selectors = [
-                "#apply",
-                "input[value='Apply']",
-                "input[type='submit'][value*='Apply']",
-                "button[value*='Apply']"
-            ]
-            
-            apply_button = None
-            for selector in apply_selectors:
-                try:
-                    apply_button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    self.logger.debug(f"Found Apply button using: {selector}")
-                    break
-                except:
-                    continue
-            
+            apply_button = self._find_first(APPLY_SELECTORS)
             if not apply_button:
                 raise Exception("Could not find Apply button")
             
             apply_button.click()
             self.logger.info("Apply button clicked, waiting for changes to take effect")
             
-            # Wait for either page refresh or success indicator
+            # Submitting the form replaces the frame document; the checkbox reappears once the router has saved
             try:
-                # Wait for the page to refresh/redirect after applying changes
-                # The router typically shows a "Please wait..." message or redirects
-                wait.until(lambda driver: 
-                    "please wait" in driver.page_source.lower() or 
-                    driver.current_url != self.driver.current_url
-                )
-                # Additional short wait for settings to actually apply on router
-                time.sleep(3)
+                wait.until(EC.staleness_of(apply_button))
+                wait.until(EC.presence_of_element_located(RADIO_CHECKBOX))
             except TimeoutException:
-                # Fallback: fixed wait if we can't detect page change
-                time.sleep(5)
+                self.logger.warning("Could not confirm the settings page reloaded after Apply")
             
             result = ActionResult.SUCCESS
             if self.config.enable_notifications:
@@ -527,22 +714,40 @@ class RouterController:
             
         except Exception as e:
             self.logger.error(f"Failed to toggle radio: {e}")
+            self._reset_session()
             if self.config.debug_mode:
                 import traceback
                 self.logger.debug(f"Toggle traceback: {traceback.format_exc()}")
                 # Save page source for debugging
-                try:
-                    with open('/tmp/toggle_debug.html', 'w') as f:
-                        f.write(self.driver.page_source)
-                    self.logger.info("DEBUG: Toggle page source saved to /tmp/toggle_debug.html")
-                except:
-                    pass
+                self._save_debug_snapshot("toggle_debug", "Toggle page snapshot")
             return ActionResult.UNEXPECTED_FAILURE
     
+    def _get_radio_status_over_http(self) -> Optional[RadioStatus]:
+        """Try reading status from static HTML before falling back to Selenium"""
+        if not self.config.use_http_fallback or not self.http_client.is_available():
+            return None
+        
+        # Only use stored credentials here; prompting is left to the browser login path
+        username, password = self.credential_manager.get_credentials()
+        if not username or not password:
+            return None
+        
+        status = self.http_client.get_radio_status(self.config.admin_url, (username, password))
+        if status is None:
+            self.logger.info("HTTP status read unavailable, falling back to browser")
+        else:
+            self.logger.info(f"Radio status read over HTTP: {status}")
+        return status
+    
     def check_radio_status(self) -> RadioStatus:
         """Check current radio status"""
         self.logger.info("Checking 2.4GHz radio status")
         
+        cached_status = self.status_cache.get()
+        if cached_status is not None:
+            self.logger.info(f"Using cached radio status: {cached_status}")
+            return cached_status
+        
         connection_ok, connection_status = self._ensure_network_connection()
         if not connection_ok:
             if connection_status == "VPN_CONNECTED":
@@ -550,18 +755,22 @@ class RouterController:
             return RadioStatus.NOT_CONNECTED_TO_ROUTER
         
         try:
-            self._initialize_driver()
+            status = self._get_radio_status_over_http()
+            if status is not None:
+                self.status_cache.set(status)
+                return status
             
-            if not self._login_to_router():
+            if not self._open_advanced_settings():
                 return RadioStatus.UNEXPECTED_FAILURE
             
-            if not self._navigate_to_advanced_settings():
-                return RadioStatus.UNEXPECTED_FAILURE
-            
-            return self._get_radio_status_from_ui()
+            status = self._get_radio_status_from_ui()
+            if status in (RadioStatus.RADIO_ON, RadioStatus.RADIO_OFF):
+                self.status_cache.set(status)
+            return status
             
         except Exception as e:
             self.logger.error(f"Unexpected error checking radio status: {e}")
+            self._reset_session()
             return RadioStatus.UNEXPECTED_FAILURE
     
     def turn_on_radio(self) -> ActionResult:
@@ -575,18 +784,14 @@ class RouterController:
             return ActionResult.NOT_CONNECTED_TO_ROUTER
         
         try:
-            self._initialize_driver()
-            
-            if not self._login_to_router():
-                return ActionResult.UNEXPECTED_FAILURE
-            
-            if not self._navigate_to_advanced_settings():
-                return ActionResult.UNEXPECTED_FAILURE
-            
-            return self._toggle_radio(enable=True)
+            result = self._toggle_radio(enable=True)
+            if result == ActionResult.SUCCESS:
+                self.status_cache.invalidate()
+            return result
             
         except Exception as e:
             self.logger.error(f"Unexpected error turning on radio: {e}")
+            self._reset_session()
             return ActionResult.UNEXPECTED_FAILURE
     
     def turn_off_radio(self) -> ActionResult:
@@ -600,18 +805,14 @@ class RouterController:
             return ActionResult.NOT_CONNECTED_TO_ROUTER
         
         try:
-            self._initialize_driver()
-            
-            if not self._login_to_router():
-                return ActionResult.UNEXPECTED_FAILURE
-            
-            if not self._navigate_to_advanced_settings():
-                return ActionResult.UNEXPECTED_FAILURE
-            
-            return self._toggle_radio(enable=False)
+            result = self._toggle_radio(enable=False)
+            if result == ActionResult.SUCCESS:
+                self.status_cache.invalidate()
+            return result
             
         except Exception as e:
             self.logger.error(f"Unexpected error turning off radio: {e}")
+            self._reset_session()
             return ActionResult.UNEXPECTED_FAILURE
 
 
@@ -637,7 +838,6 @@ def main():
     
     # Load configuration
     if args.config:
-        from pathlib import Path
         config = RouterConfig.from_yaml(Path(args.config))
     else:
         config = RouterConfig.from_yaml()
@@ -653,13 +853,13 @@ def main():
     with RouterController(config) as controller:
         if args.action == "status":
             result = controller.check_radio_status()
-            print(format_status_output(result.value, "status"))
+            write_status_output(str(result))
         elif args.action == "on":
             result = controller.turn_on_radio()
-            print(format_status_output(result.value, "on"))
+            write_status_output(str(result))
         elif args.action == "off":
             result = controller.turn_off_radio()
-            print(format_status_output(result.value, "off"))
+            write_status_output(str(result))
 
     elapsed = datetime.now() - start_time
     print(f"Total Time: {elapsed.total_seconds():.1f}s")
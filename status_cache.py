@@ -0,0 +1,46 @@
+"""Short-lived on-disk cache of the last observed radio status"""
+
+import json
+import time
+from pathlib import Path
+from typing import Optional
+
+from models import RadioStatus
+
+
+class StatusCache:
+    """TTL cache so repeated status checks skip the browser round trip"""
+
+    def __init__(self, ttl_seconds: int, cache_path: Optional[Path] = None):
+        self.ttl_seconds = ttl_seconds
+        self.cache_path = cache_path or Path.home() / ".router_controller_status.json"
+
+    def get(self) -> Optional[RadioStatus]:
+        """Return the cached status if it is still fresh"""
+        if self.ttl_seconds <= 0:
+            return None
+        try:
+            with open(self.cache_path, 'r') as f:
+                cached = json.load(f)
+            if time.time() - cached['timestamp'] < self.ttl_seconds:
+                return RadioStatus[cached['status']]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def set(self, status: RadioStatus):
+        """Record a freshly observed status"""
+        if self.ttl_seconds <= 0:
+            return
+        try:
+            with open(self.cache_path, 'w') as f:
+                json.dump({'timestamp': time.time(), 'status': str(status)}, f)
+        except OSError:
+            pass
+
+    def invalidate(self):
+        """Drop the cached status after the radio state changes"""
+        try:
+            self.cache_path.unlink()
+        except OSError:
+            pass
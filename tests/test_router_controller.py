@@ -0,0 +1,80 @@
+"""Tests for RouterController session reuse"""
+
+import unittest
+from unittest import mock
+
+from models import ActionResult
+from router_controller import RouterController
+
+
+class FakeDriver:
+    """Driver that, like Selenium, only yields a script's value when the script returns it"""
+
+    def __init__(self, status_class: str = "img_status_good", current_url: str = "https://routerlogin.net/adv_index.htm"):
+        self.status_class = status_class
+        self.current_url = current_url
+        self.switch_to = mock.Mock()
+
+    def execute_script(self, script: str, *args):
+        return self.status_class if script.lstrip().startswith("return") else None
+
+    def execute_cdp_cmd(self, cmd: str, params: dict):
+        return {"result": {"value": self.status_class}}
+
+
+def make_controller(driver: FakeDriver) -> RouterController:
+    """RouterController holding a fake driver, without touching config, keychain or Chrome"""
+    controller = RouterController.__new__(RouterController)
+    controller.logger = mock.Mock()
+    controller.driver = driver
+    controller._logged_in = True
+    controller._on_advanced = True
+    return controller
+
+
+class SessionAliveTest(unittest.TestCase):
+
+    def test_status_indicator_means_alive(self):
+        self.assertTrue(make_controller(FakeDriver())._is_session_alive())
+
+    def test_missing_indicator_means_dead(self):
+        self.assertFalse(make_controller(FakeDriver(status_class=None))._is_session_alive())
+
+    def test_login_page_means_dead(self):
+        driver = FakeDriver(current_url="https://routerlogin.net/login.htm")
+        self.assertFalse(make_controller(driver)._is_session_alive())
+
+
+
+class KnownRadioStatusTest(unittest.TestCase):
+
+    def _toggle(self, status_class: str, enable: bool, on_advanced: bool = True):
+        controller = make_controller(FakeDriver(status_class))
+        controller._on_advanced = on_advanced
+        controller._open_wireless_form = mock.Mock(return_value=False)
+        controller._ensure_logged_in = mock.Mock(return_value=True)
+        controller.config = mock.Mock(timeout=1, debug_mode=False)
+        with mock.patch('router_controller.WebDriverWait', create=True):
+            return controller._toggle_radio(enable), controller._open_wireless_form
+
+    def test_already_on_skips_wireless_form(self):
+        result, open_form = self._toggle("img_status_good", enable=True)
+        self.assertEqual(result, ActionResult.ALREADY_ON)
+        open_form.assert_not_called()
+
+    def test_already_off_skips_wireless_form(self):
+        result, open_form = self._toggle("img_status_error", enable=False)
+        self.assertEqual(result, ActionResult.ALREADY_OFF)
+        open_form.assert_not_called()
+
+    def test_opposite_state_opens_wireless_form(self):
+        _, open_form = self._toggle("img_status_good", enable=False)
+        open_form.assert_called_once()
+
+    def test_no_open_advanced_view_opens_wireless_form(self):
+        _, open_form = self._toggle("img_status_good", enable=True, on_advanced=False)
+        open_form.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,25 @@
 """Utility functions and decorators for router controller"""
 
+import asyncio
+import atexit
+import collections
 import time
 import functools
-from typing import Callable, Any, TypeVar
+import queue
+import random
+import shutil
+import sys
+import threading
+from typing import Callable, Any, List, Optional, TextIO, Tuple, TypeVar
 import subprocess
 
 
 F = TypeVar('F', bound=Callable[..., Any])
 
 
-def retry(tries: int = 3, delay: int = 2, backoff: float = 1.5, exceptions: tuple = (Exception,)):
+def retry(tries: int = 3, delay: int = 2, backoff: float = 1.5, exceptions: tuple = (Exception,),
+          jitter: float = 0.2, max_delay: Optional[float] = None,
+          retry_if: Optional[Callable[[Exception], bool]] = None):
     """
     Enhanced retry decorator with exponential backoff and selective exception handling.
     
@@ -18,57 +28,297 @@ def retry(tries: int = 3, delay: int = 2, backoff: float = 1.5, exceptions: tupl
         delay: Initial delay between attempts (seconds)
         backoff: Multiplier for delay after each failure
         exceptions: Tuple of exceptions to retry on (default: all exceptions)
+        jitter: Fraction by which each delay is randomly spread (0 disables)
+        max_delay: Upper bound for a single delay (seconds)
+        retry_if: Predicate on the exception; returning False re-raises without waiting
     """
     def decorator(func: F) -> F:
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            attempt = 1
             current_delay = delay
-            last_exception = None
             
-            while attempt <= tries:
+            # Resolve the owner's logger and spinner once rather than on every failure
+            logger = getattr(args[0], 'logger', None) if args else None
+            spinner = getattr(logger, 'progress_spinner', None)
+            
+            for attempt in range(1, tries + 1):
                 try:
                     return func(*args, **kwargs)
                 except exceptions as e:
-                    last_exception = e
-                    if attempt == tries:
+                    if attempt == tries or (retry_if is not None and not retry_if(e)):
                         raise e
                     
-                    if hasattr(args[0], 'logger'):
-                        args[0].logger.warning(
+                    # Spread retries so callers that failed together don't retry together
+                    sleep_for = current_delay * (1 - jitter + 2 * jitter * random.random())
+                    if max_delay is not None:
+                        sleep_for = min(sleep_for, max_delay)
+                    
+                    if logger is not None:
+                        logger.warning(
                             f"Attempt {attempt}/{tries} failed: {type(e).__name__}: {e}"
                         )
                         
-                        # Show retry countdown with continuous counter
-                        if hasattr(args[0].logger, '_start_continuous_counter'):
-                            counter_stop = args[0].logger._start_continuous_counter(
+                        # Show retry countdown, redrawing the spinner while we wait
+                        if spinner is not None:
+                            with spinner(
                                 f"Retrying... (attempt {attempt + 1}/{tries})"
-                            )
-                            if counter_stop:
-                                time.sleep(current_delay)
-                                counter_stop.set()
-                            else:
-                                time.sleep(current_delay)
+                            ) as tick:
+                                _sleep_with_ticks(sleep_for, tick)
                         else:
-                            time.sleep(current_delay)
+                            time.sleep(sleep_for)
                     else:
-                        time.sleep(current_delay)
+                        time.sleep(sleep_for)
                     
                     current_delay *= backoff
-                    attempt += 1
-                except Exception as e:
-                    # Don't retry on unexpected exceptions
-                    raise e
+        return wrapper
+    return decorator
+
+
+def async_retry(tries: int = 3, delay: int = 2, backoff: float = 1.5, exceptions: tuple = (Exception,),
+                jitter: float = 0.2, max_delay: Optional[float] = None,
+                retry_if: Optional[Callable[[Exception], bool]] = None):
+    """
+    Coroutine counterpart of retry that backs off without blocking the event loop.
+    
+    The decorated coroutine accepts an optional cancel_event keyword (an asyncio.Event
+    created in the caller's loop); once set, the backoff is abandoned and the last
+    failure re-raised. It is taken per call because an Event binds to one event loop.
+    
+    Args:
+        tries, delay, backoff, exceptions, jitter, max_delay, retry_if: As for retry
+    """
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        async def wrapper(*args, cancel_event: Optional[asyncio.Event] = None, **kwargs):
+            current_delay = delay
+            logger = getattr(args[0], 'logger', None) if args else None
             
-            # This should never be reached, but just in case
-            raise last_exception or Exception("Retry logic failed unexpectedly")
+            for attempt in range(1, tries + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except exceptions as e:
+                    if attempt == tries or (retry_if is not None and not retry_if(e)):
+                        raise e
+                    
+                    sleep_for = current_delay * (1 - jitter + 2 * jitter * random.random())
+                    if max_delay is not None:
+                        sleep_for = min(sleep_for, max_delay)
+                    
+                    if logger is not None:
+                        logger.warning(
+                            f"Attempt {attempt}/{tries} failed: {type(e).__name__}: {e}"
+                        )
+                    
+                    if cancel_event is None:
+                        await asyncio.sleep(sleep_for)
+                    else:
+                        try:
+                            await asyncio.wait_for(cancel_event.wait(), timeout=sleep_for)
+                        except asyncio.TimeoutError:
+                            pass
+                        else:
+                            raise e
+                    
+                    current_delay *= backoff
         return wrapper
     return decorator
 
 
+def _sleep_with_ticks(duration: float, tick: Callable[[], None], interval: float = 0.1):
+    """Sleep for duration seconds, calling tick() between short sleeps"""
+    deadline = time.monotonic() + duration
+    while True:
+        tick()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(interval, remaining))
+
+
+class _NotifierProcess:
+    """Long-lived interactive osascript that runs each line written to it as a script"""
+    
+    def __init__(self):
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._errors = 0
+    
+    def send(self, script: str) -> bool:
+        """Run a one-line AppleScript, starting osascript on first use"""
+        with self._lock:
+            try:
+                if self._proc is None or self._proc.poll() is not None:
+                    self._proc = subprocess.Popen(
+                        ['osascript', '-i'],
+                        stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                        bufsize=-1, text=True
+                    )
+                    threading.Thread(target=self._count_errors, args=(self._proc,), daemon=True).start()
+                self._proc.stdin.write(script + "\n")
+                self._proc.stdin.flush()
+                return True
+            except (OSError, ValueError):
+                self._proc = None
+                return False
+    
+    def _count_errors(self, proc: subprocess.Popen):
+        """Count the error lines osascript reports for scripts that failed to run"""
+        for line in proc.stderr:
+            if line.strip():
+                with self._lock:
+                    self._errors += 1
+    
+    def take_errors(self) -> int:
+        """Return the number of script errors reported since the last call"""
+        with self._lock:
+            errors, self._errors = self._errors, 0
+            return errors
+    
+    def close(self):
+        """Let pending notifications finish and stop osascript"""
+        with self._lock:
+            if self._proc is None:
+                return
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=5)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                self._proc.kill()
+            self._proc = None
+
+
+_NOTIFIER = _NotifierProcess()
+atexit.register(_NOTIFIER.close)
+
+# AppleScript string literals need quotes and backslashes escaped; newlines would end the line in osascript -i
+_APPLESCRIPT_ESCAPE = str.maketrans({'"': '\\"', '\\': '\\\\', '\n': ' ', '\r': ' '})
+_SCRIPT_TEMPLATE_SOUND = 'display notification "{m}" with title "{t}" with sound name "default"'
+_SCRIPT_TEMPLATE_SILENT = 'display notification "{m}" with title "{t}"'
+
+_OSASCRIPT_ARGV = ('osascript',)
+
+# Posts a notification with a single exec and no AppleScript startup, when installed
+_TERMINAL_NOTIFIER = shutil.which('terminal-notifier')
+# terminal-notifier runs detached; exit codes are collected on the next batch
+_terminal_notifier_procs: List[subprocess.Popen] = []
+
+# Notifications are handed to a background thread that coalesces bursts into one write
+_NOTIFICATION_QUEUE: 'queue.Queue[Tuple[str, str, bool]]' = queue.Queue()
+_NOTIFICATION_BATCH_SIZE = 10
+_NOTIFICATION_BATCH_WINDOW = 0.05
+_notification_worker: Optional[threading.Thread] = None
+_notification_worker_lock = threading.Lock()
+
+# Identical notifications within the same 2 second window are only shown once
+_NOTIFICATION_DEDUPE_WINDOW = 2
+_recent_notifications: 'collections.deque[Tuple[str, str, int]]' = collections.deque(maxlen=8)
+
+# After repeated delivery failures, stop queueing notifications for a cooldown period.
+# Both are guarded by _notification_worker_lock
+_NOTIFICATION_FAILURE_THRESHOLD = 3
+_NOTIFICATION_COOLDOWN = 60.0
+_notification_failures = 0
+_notification_suspended_until = 0.0
+
+
+def _notification_script(title: str, message: str, sound: bool) -> str:
+    """One-line AppleScript that displays a notification"""
+    template = _SCRIPT_TEMPLATE_SOUND if sound else _SCRIPT_TEMPLATE_SILENT
+    return template.format(m=message.translate(_APPLESCRIPT_ESCAPE), t=title.translate(_APPLESCRIPT_ESCAPE))
+
+
+def _reap_terminal_notifiers() -> bool:
+    """Collect finished terminal-notifier processes, returning False if any of them failed"""
+    ok = True
+    running = []
+    for proc in _terminal_notifier_procs:
+        code = proc.poll()
+        if code is None:
+            running.append(proc)
+        elif code != 0:
+            ok = False
+    _terminal_notifier_procs[:] = running
+    return ok
+
+
+def _post_notifications(notifications) -> bool:
+    """
+    Hand a batch of (title, message, sound) notifications to the fastest available notifier.
+    
+    Delivery is asynchronous, so failures reported for earlier batches are picked up here.
+    
+    Returns:
+        False if posting failed or an earlier delivery has since reported an error
+    """
+    if _TERMINAL_NOTIFIER:
+        ok = _reap_terminal_notifiers()
+        for title, message, sound in notifications:
+            # Don't wait for the banner; the exit code is checked on the next batch
+            _terminal_notifier_procs.append(subprocess.Popen(
+                [_TERMINAL_NOTIFIER, '-title', title, '-message', message, *(['-sound', 'default'] if sound else [])],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                close_fds=False
+            ))
+        return ok
+    
+    scripts = [_notification_script(*notification) for notification in notifications]
+    # Reuse one osascript process; spawn a fresh one only if that fails
+    if _NOTIFIER.send("\n".join(scripts)):
+        return _NOTIFIER.take_errors() == 0
+    
+    argv = list(_OSASCRIPT_ARGV)
+    for script in scripts:
+        argv += ['-e', script]
+    # Output is never read, so skip the pipes; Python's own fds are non-inheritable,
+    # so the fd-table sweep of close_fds buys nothing here
+    result = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=False, check=False)
+    return result.returncode == 0
+
+
+def _record_notification_result(delivered: bool):
+    """Track consecutive delivery failures, suspending notifications once they pile up"""
+    global _notification_failures, _notification_suspended_until
+    
+    with _notification_worker_lock:
+        if delivered:
+            _notification_failures = 0
+            return
+        _notification_failures += 1
+        if _notification_failures >= _NOTIFICATION_FAILURE_THRESHOLD:
+            _notification_suspended_until = time.monotonic() + _NOTIFICATION_COOLDOWN
+
+
+def _deliver_notifications():
+    """Drain the notification queue, sending each burst in one go"""
+    while True:
+        notifications = [_NOTIFICATION_QUEUE.get()]
+        while len(notifications) < _NOTIFICATION_BATCH_SIZE:
+            try:
+                notifications.append(_NOTIFICATION_QUEUE.get(timeout=_NOTIFICATION_BATCH_WINDOW))
+            except queue.Empty:
+                break
+        try:
+            delivered = _post_notifications(notifications)
+        except Exception:
+            delivered = False
+        _record_notification_result(delivered)
+        for _ in notifications:
+            _NOTIFICATION_QUEUE.task_done()
+
+
+def flush_notifications():
+    """Block until every queued notification has been handed to the notifier"""
+    if _notification_worker is not None:
+        _NOTIFICATION_QUEUE.join()
+
+
+# Registered after _NOTIFIER.close so it runs first at exit
+atexit.register(flush_notifications)
+
+
 def send_notification(title: str, message: str, sound: bool = True) -> bool:
     """
-    Send macOS notification using osascript.
+    Queue a macOS notification for delivery via terminal-notifier or osascript.
     
     Args:
         title: Notification title
@@ -76,58 +326,80 @@ def send_notification(title: str, message: str, sound: bool = True) -> bool:
         sound: Whether to play sound
     
     Returns:
-        True if notification sent successfully
+        True if the notification was queued, False while recent deliveries keep failing
     """
-    try:
-        sound_param = "with sound name \"default\"" if sound else ""
-        script = f'''
-        display notification "{message}" with title "{title}" {sound_param}
-        '''
-        
-        result = subprocess.run([
-            'osascript', '-e', script
-        ], capture_output=True, text=True)
-        
-        return result.returncode == 0
-    except Exception:
-        return False
-
-
-def format_status_output(status_value: str, action_type: str = "status") -> str:
+    global _notification_worker
+    
+    now = time.monotonic()
+    key = (title, message, int(now // _NOTIFICATION_DEDUPE_WINDOW))
+    with _notification_worker_lock:
+        if now < _notification_suspended_until:
+            return False
+        if key in _recent_notifications:
+            return True
+        _recent_notifications.append(key)
+        if _notification_worker is None:
+            _notification_worker = threading.Thread(target=_deliver_notifications, daemon=True)
+            _notification_worker.start()
+    _NOTIFICATION_QUEUE.put((title, message, sound))
+    return True
+
+
+# ANSI color codes
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+BOLD = '\033[1m'
+RESET = '\033[0m'
+
+_STATUS_MAP = {
+    # Status results
+    'RADIO_ON': (f'🟢 {GREEN}{BOLD}RADIO ON{RESET}', 'Radio is currently enabled'),
+    'RADIO_OFF': (f'🔴 {RED}{BOLD}RADIO OFF{RESET}', 'Radio is currently disabled'),
+    
+    # Action results
+    'SUCCESS': (f'✅ {GREEN}{BOLD}SUCCESS{RESET}', 'Operation completed successfully'),
+    'ALREADY_ON': (f'🔵 {BLUE}{BOLD}ALREADY ON{RESET}', 'Radio was already enabled'),
+    'ALREADY_OFF': (f'🔵 {BLUE}{BOLD}ALREADY OFF{RESET}', 'Radio was already disabled'),
+    
+    # Error conditions
+    'NOT_CONNECTED_TO_ROUTER': (f'📡 {YELLOW}{BOLD}NOT CONNECTED{RESET}', 'Please connect to router network'),
+    'VPN_CONNECTED': (f'🔒 {YELLOW}{BOLD}VPN DETECTED{RESET}', 'Please disconnect VPN and try again'),
+    'UNEXPECTED_FAILURE': (f'❌ {RED}{BOLD}FAILED{RESET}', 'An unexpected error occurred'),
+}
+_UNKNOWN_STATUS = (f'❓ {BOLD}UNKNOWN{RESET}', 'Unknown status')
+
+# Fully formatted output per status, built once at import
+_STATUS_OUTPUT = {
+    status: f"\n{emoji_status}\n{description}\n"
+    for status, (emoji_status, description) in _STATUS_MAP.items()
+}
+_UNKNOWN_OUTPUT = f"\n{_UNKNOWN_STATUS[0]}\n{_UNKNOWN_STATUS[1]}\n"
+
+
+def format_status_output(status_value: str) -> str:
     """
     Format status output with colors and emojis for maximum clarity.
     
     Args:
         status_value: The status/result value
-        action_type: Type of action (status, on, off)
     
     Returns:
         Formatted colored string with emoji
     """
-    # ANSI color codes
-    GREEN = '\033[92m'
-    RED = '\033[91m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    BOLD = '\033[1m'
-    RESET = '\033[0m'
-    
-    status_map = {
-        # Status results
-        'RADIO_ON': (f'🟢 {GREEN}{BOLD}RADIO ON{RESET}', 'Radio is currently enabled'),
-        'RADIO_OFF': (f'🔴 {RED}{BOLD}RADIO OFF{RESET}', 'Radio is currently disabled'),
-        
-        # Action results
-        'SUCCESS': (f'✅ {GREEN}{BOLD}SUCCESS{RESET}', 'Operation completed successfully'),
-        'ALREADY_ON': (f'🔵 {BLUE}{BOLD}ALREADY ON{RESET}', 'Radio was already enabled'),
-        'ALREADY_OFF': (f'🔵 {BLUE}{BOLD}ALREADY OFF{RESET}', 'Radio was already disabled'),
-        
-        # Error conditions
-        'NOT_CONNECTED_TO_ROUTER': (f'📡 {YELLOW}{BOLD}NOT CONNECTED{RESET}', 'Please connect to router network'),
-        'VPN_CONNECTED': (f'🔒 {YELLOW}{BOLD}VPN DETECTED{RESET}', 'Please disconnect VPN and try again'),
-        'UNEXPECTED_FAILURE': (f'❌ {RED}{BOLD}FAILED{RESET}', 'An unexpected error occurred'),
-    }
-    
-    emoji_status, description = status_map.get(status_value, (f'❓ {BOLD}UNKNOWN{RESET}', 'Unknown status'))
-    
-    return f"\n{emoji_status}\n{description}\n"
\ No newline at end of file
+    return _STATUS_OUTPUT.get(status_value, _UNKNOWN_OUTPUT)
+
+
+def write_status_output(status_value: str, out: Optional[TextIO] = None, end: str = '\n'):
+    """
+    Write formatted status output straight to a stream, like print(format_status_output(...)).
+    
+    Args:
+        status_value: The status/result value
+        out: Stream to write to, defaulting to the current sys.stdout
+        end: Text written after the status block
+    """
+    out = out or sys.stdout
+    out.write(_STATUS_OUTPUT.get(status_value, _UNKNOWN_OUTPUT))
+    out.write(end)
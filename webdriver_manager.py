@@ -1,54 +1,289 @@
 """Chrome WebDriver management for router controller"""
 
-from typing import Optional, TYPE_CHECKING
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+import os
+import select
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+
+from browser_pool import BrowserPool
 
 if TYPE_CHECKING:
+    from selenium import webdriver
     from .logger import Logger
 
 
+# Drivers are shared between managers with identical settings so back-to-back actions skip Chrome startup
+_pools: Dict[Tuple[bool, bool, Optional[str], Optional[str], bool], BrowserPool] = {}
+
+# Chrome refuses a profile another running instance holds, so each profile has at most one owner
+_profile_owners: Dict[Path, Optional[int]] = {}
+_profile_owners_lock = threading.Lock()
+
+# Where a persistent browser listens, and how it is found and started when it isn't running yet
+DEFAULT_DEBUGGER_ADDRESS = "127.0.0.1:9222"
+PERSISTENT_PROFILE_DIR = "~/.cache/router_controller/chrome-persistent"
+CHROME_LAUNCH_TIMEOUT = 10.0
+CHROME_CANDIDATES = (
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+)
+
+
 class WebDriverManager:
     """Chrome WebDriver management"""
     
-    def __init__(self, logger: 'Logger', headless: bool = False, debug_mode: bool = False):
+    def __init__(self, logger: 'Logger', headless: bool = False, debug_mode: bool = False,
+                 profile_dir: Optional[str] = None, debugger_address: Optional[str] = None,
+                 persistent: bool = False):
         self.logger = logger
         self.headless = headless
         self.debug_mode = debug_mode
-        self.driver: Optional[webdriver.Chrome] = None
+        self.profile_dir = profile_dir
+        self.persistent = persistent
+        self.debugger_address = debugger_address or (DEFAULT_DEBUGGER_ADDRESS if persistent else None)
+        self.driver: Optional['webdriver.Chrome'] = None
+    
+    @property
+    def _pool_key(self) -> Tuple[bool, bool, Optional[str], Optional[str], bool]:
+        """Every setting the driver factories read, so pooled drivers match this manager"""
+        return (self.headless, self.debug_mode, self.profile_dir or None, self.debugger_address, self.persistent)
+    
+    def create_driver(self) -> 'webdriver.Chrome':
+        """Acquire a Chrome driver from the shared pool"""
+        factory = self._attach_driver if self.debugger_address else self._build_driver
+        pool = _pools.get(self._pool_key)
+        if pool is None:
+            pool = _pools[self._pool_key] = BrowserPool(factory, close=self._close_driver)
+        # New drivers are built by this manager so they log to its logger
+        self.driver = pool.acquire(factory)
+        return self.driver
+    
+    def _attach_driver(self) -> 'webdriver.Chrome':
+        """Open a tab of our own in an already running Chrome"""
+        if self.persistent and not self._debugger_listening():
+            self._launch_browser()
+        
+        # Selenium is only imported once a browser is actually needed
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
+        options = Options()
+        options.debugger_address = self.debugger_address
+        try:
+            driver = webdriver.Chrome(options=options)
+            # Leave the browser's existing tabs alone; each driver works in a fresh one
+            driver.switch_to.new_window('tab')
+            self.logger.info(f"Attached to Chrome at {self.debugger_address}")
+            return driver
+        except Exception as e:
+            self.logger.error(f"Failed to attach to Chrome at {self.debugger_address}: {e}")
+            raise
+    
+    def _debugger_listening(self) -> bool:
+        """Whether something accepts connections on the DevTools address"""
+        host, port = self.debugger_address.rsplit(':', 1)
+        try:
+            with socket.create_connection((host, int(port)), timeout=0.25):
+                return True
+        except OSError:
+            return False
+    
+    def _launch_browser(self):
+        """Start a detached Chrome with remote debugging that outlives this process"""
+        binary = next((c for c in CHROME_CANDIDATES if shutil.which(c) or Path(c).exists()), None)
+        if binary is None:
+            raise RuntimeError("Chrome executable not found for persistent browser")
+        
+        # A profile of its own, so the long-lived browser never locks the one normal runs use
+        profile = self._profile_path(PERSISTENT_PROFILE_DIR)
+        port = self.debugger_address.rsplit(':', 1)[1]
+        args = [
+            binary,
+            f'--remote-debugging-port={port}',
+            f'--user-data-dir={profile}',
+            '--no-first-run',
+            '--no-default-browser-check',
+        ]
+        if self.headless:
+            args.append('--headless')
+        
+        self.logger.info(f"Starting persistent Chrome on port {port}")
+        subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        
+        deadline = time.monotonic() + CHROME_LAUNCH_TIMEOUT
+        while not self._debugger_listening():
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Chrome did not open {self.debugger_address} in time")
+            time.sleep(0.1)
+    
+    def _profile_path(self, profile_dir: Optional[str] = None) -> Optional[Path]:
+        """Resolve and create the Chrome profile directory, if one is configured"""
+        profile_dir = profile_dir or self.profile_dir
+        if not profile_dir:
+            return None
+        profile = Path(profile_dir).expanduser()
+        # Headed and headless Chrome can't share one profile
+        if self.headless:
+            profile = profile.with_name(profile.name + "-headless")
+        profile.mkdir(parents=True, exist_ok=True)
+        return profile
+    
+    def _close_driver(self, driver: 'webdriver.Chrome'):
+        """Quit a driver, closing only its own tab when attached to a shared Chrome"""
+        try:
+            if self.debugger_address:
+                driver.close()
+        finally:
+            try:
+                driver.quit()
+            finally:
+                self._release_profile(id(driver))
+    
+    def _claim_profile(self) -> Optional[Path]:
+        """Reserve the configured profile, or return None if another driver or process already holds it"""
+        profile = self._profile_path()
+        if profile is None:
+            return None
+        with _profile_owners_lock:
+            if profile in _profile_owners or self._profile_locked(profile):
+                self.logger.debug(f"Chrome profile {profile} is in use, starting with a temporary one")
+                return None
+            _profile_owners[profile] = None
+        return profile
+    
+    @staticmethod
+    def _profile_locked(profile: Path) -> bool:
+        """Whether a running Chrome, e.g. another router_controller run, holds the profile's SingletonLock"""
+        try:
+            # Chrome points the lock symlink at "<hostname>-<pid>" of the owning browser
+            target = os.readlink(profile / "SingletonLock")
+        except OSError:
+            return False
+        host, _, pid = target.rpartition('-')
+        if host != socket.gethostname():
+            return True
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            # Left behind by a Chrome that crashed; Chrome clears it on startup
+            return False
+        except (ValueError, PermissionError):
+            return True
+        return True
     
-    def create_driver(self) -> webdriver.Chrome:
+    @staticmethod
+    def _release_profile(driver_id: int):
+        """Free the profile held by the given driver, if any"""
+        with _profile_owners_lock:
+            for profile, owner in list(_profile_owners.items()):
+                if owner == driver_id:
+                    del _profile_owners[profile]
+    
+    def _build_driver(self) -> 'webdriver.Chrome':
         """Create and configure Chrome driver"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
         options = Options()
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-gpu')
         options.add_argument('--window-size=1280,720')
+        # Subsystems the router pages never need; skipping them trims startup time and memory
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-background-networking')
+        options.add_argument('--disable-sync')
+        options.add_argument('--disable-default-apps')
+        options.add_argument('--disable-translate')
+        options.add_argument('--disable-features=Translate,BackForwardCache,MediaRouter')
         options.add_experimental_option('excludeSwitches', ['enable-logging'])
         options.add_experimental_option('useAutomationExtension', False)
-        
+
+        # Only text and attributes are inspected, so skip heavy resources unless debugging visually
+        if not self.debug_mode:
+            options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.managed_default_content_settings.stylesheets': 2,
+                'profile.managed_default_content_settings.fonts': 2
+            })
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.page_load_strategy = 'eager'
+
         if self.headless:
             options.add_argument('--headless')
             self.logger.info("Running in headless mode")
         
+        # Keep router cookies between runs
+        profile = self._claim_profile()
+        if profile:
+            options.add_argument(f'--user-data-dir={profile}')
+        
         try:
-            self.driver = webdriver.Chrome(options=options)
-            self.logger.info("Chrome driver initialized")
-            return self.driver
+            driver = webdriver.Chrome(options=options)
         except Exception as e:
+            if profile:
+                with _profile_owners_lock:
+                    del _profile_owners[profile]
             self.logger.error(f"Failed to create Chrome driver: {e}")
             raise
+        if profile:
+            with _profile_owners_lock:
+                _profile_owners[profile] = id(driver)
+        self.logger.info("Chrome driver initialized")
+        return driver
+    
+    def _wait_for_enter(self, prompt: str):
+        """Wait for Enter on stdin, returning early on EOF or SIGTERM"""
+        shutdown = threading.Event()
+        installed = False
+        try:
+            previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: shutdown.set())
+            installed = True
+        except ValueError:
+            # Signal handlers can only be installed from the main thread
+            pass
+        
+        print(prompt, end='', flush=True)
+        try:
+            while not shutdown.is_set():
+                try:
+                    ready, _, _ = select.select([sys.stdin], [], [], 1.0)
+                except (OSError, ValueError):
+                    # stdin closed or not selectable; nobody can press Enter
+                    return
+                if ready:
+                    sys.stdin.readline()
+                    return
+            self.logger.info("Termination requested, closing browser...")
+        finally:
+            if installed:
+                signal.signal(signal.SIGTERM, previous_handler)
     
-    def cleanup(self):
-        """Clean up WebDriver resources"""
+    def cleanup(self, ok: bool = True):
+        """Return the driver to the pool, quitting it if the session failed"""
         if self.driver:
             try:
                 if self.debug_mode:
                     self.logger.info("Debug mode: Browser window will stay open for inspection...")
                     try:
-                        input("Press Enter to close browser and continue...")
-                    except (EOFError, KeyboardInterrupt):
+                        self._wait_for_enter("Press Enter to close browser and continue...")
+                    except KeyboardInterrupt:
                         self.logger.info("Debug mode interrupted, closing browser...")
-                self.driver.quit()
+                _pools[self._pool_key].release(self.driver, ok)
+                self.driver = None
             except Exception as e:
                 self.logger.error(f"Error during cleanup: {e}")
\ No newline at end of file